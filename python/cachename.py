@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
 
 def expand_filenames(frequency, base_name, start_date, end_date):
     parts = base_name.split('.')
@@ -9,54 +13,76 @@ def expand_filenames(frequency, base_name, start_date, end_date):
     *dirs, identifier = parts
     directory_path = "/".join(dirs)
 
-    start = datetime.strptime(start_date, "%Y%m%d")
-    end = datetime.strptime(end_date, "%Y%m%d")
-
     if frequency != 'Daily':
         raise ValueError("Only 'Daily' frequency is supported in this example")
 
-    filenames = []
-    current_date = start
-    while current_date <= end:
-        date_str = current_date.strftime("%Y%m%d")
-        filename = f"{directory_path}/{identifier}/{identifier}_{date_str}.pqt"
-        filenames.append(filename)
-        current_date += timedelta(days=1)
-    
-    return filenames
+    start = pd.to_datetime(start_date, format="%Y%m%d")
+    end = pd.to_datetime(end_date, format="%Y%m%d")
+    dates = pd.date_range(start, end, freq='D').strftime("%Y%m%d")
+
+    prefix = f"{directory_path}/{identifier}/{identifier}_"
+    return [prefix + date_str + ".pqt" for date_str in dates]
 
-def load(frequency, base_name, start_date, end_date):
+def load(frequency, base_name, start_date, end_date, filesystem=None, prefetch_limit=8,
+         memory_map=True, as_arrow=False):
     """
     Load data from files for each date in the specified range.
 
+    All files are scanned as one Arrow dataset, so footer reads and column
+    chunk fetches are issued concurrently instead of one file at a time. Up to
+    `prefetch_limit` files are fetched ahead while earlier ones are decoded,
+    which bounds memory while keeping both I/O and CPU busy. Local files are
+    memory-mapped by default, so plain-encoded column data is read straight
+    from the page cache instead of being copied into Arrow buffers.
+
     Parameters:
     - frequency (str): Frequency of the files (e.g., 'Daily').
     - base_name (str): Base name in a dot-separated format.
     - start_date (str): Start date in 'YYYYMMDD' format.
     - end_date (str): End date in 'YYYYMMDD' format.
+    - filesystem (pyarrow.fs.FileSystem, optional): Filesystem to read from. Defaults to the local filesystem.
+    - prefetch_limit (int): Maximum number of files read ahead of the decoder.
+    - memory_map (bool): Memory-map files when reading from the default local filesystem.
+    - as_arrow (bool): Return the pyarrow.Table instead of converting it to pandas.
 
     Returns:
-    - list: List of data loaded from each file.
+    - pd.DataFrame or pa.Table: Data from all existing files, concatenated in date order.
     """
     filenames = expand_filenames(frequency, base_name, start_date, end_date)
-    data = []
-    
-    for filename in filenames:
-        try:
-            print(f"Loading data from {filename}")
-            df = pd.read_parquet(filename)
-            data.append(df)
-        except FileNotFoundError:
-            print(f"File not found: {filename}")
-        except Exception as e:
-            print(f"Error loading {filename}: {e}")
-    
-    return data
+    if filesystem is None:
+        filesystem = pafs.LocalFileSystem(use_mmap=memory_map)
+
+    # One batched stat call instead of a try/except per file
+    paths = []
+    for info in filesystem.get_file_info(filenames):
+        if info.type == pafs.FileType.NotFound:
+            print(f"File not found: {info.path}")
+        else:
+            paths.append(info.path)
+
+    if not paths:
+        return pa.table({}) if as_arrow else pd.DataFrame()
+
+    print(f"Loading data from {len(paths)} files")
+    parquet_format = ds.ParquetFileFormat(
+        default_fragment_scan_options=ds.ParquetFragmentScanOptions(pre_buffer=True)
+    )
+    dataset = ds.dataset(paths, format=parquet_format, filesystem=filesystem)
+    table = dataset.to_table(
+        use_threads=True,
+        batch_readahead=2 * prefetch_limit,
+        fragment_readahead=prefetch_limit,
+    )
+    if as_arrow:
+        return table
+    return table.to_pandas(split_blocks=True, self_destruct=True)
 
 def store(data_list, frequency, base_name, start_date, end_date):
     """
     Store data to files for each date in the specified range.
 
+    Files are written concurrently with zstd compression.
+
     Parameters:
     - data_list (list of pd.DataFrame): List of dataframes to store, one for each date.
     - frequency (str): Frequency of the files (e.g., 'Daily').
@@ -69,13 +95,17 @@ def store(data_list, frequency, base_name, start_date, end_date):
     if len(data_list) != len(filenames):
         raise ValueError("The length of data_list must match the number of generated filenames.")
     
-    for filename, df in zip(filenames, data_list):
+    def _store_one(filename, df):
         try:
             print(f"Storing data to {filename}")
-            df.to_parquet(filename)
+            df.to_parquet(filename, compression="zstd")
         except Exception as e:
             print(f"Error storing {filename}: {e}")
 
+    # Parquet encoding and file I/O release the GIL, so writes overlap
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(filenames)))) as executor:
+        list(executor.map(_store_one, filenames, data_list))
+
 # Example usage:
 # Assuming we have data to store for dates '20210101' and '20210102'
 data1 = pd.DataFrame({'value': [1, 2, 3]})
@@ -87,5 +117,4 @@ store(data_list, "Daily", "data.md.other.name", "20210101", "20210102")
 
 # Load data
 loaded_data = load("Daily", "data.md.other.name", "20210101", "20210102")
-for data in loaded_data:
-    print(data)
+print(loaded_data)
@@ -1,8 +1,11 @@
-import networkx as nx
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from collections import defaultdict
+import itertools
+import queue
 import time
 
+_TASK_DONE = object()
+
 def execute_task(task):
     """Simulate task execution."""
     print(f"Starting task: {task}")
@@ -17,44 +20,63 @@ def run_tasks_with_dependencies(task_dependencies):
     Parameters:
     - task_dependencies (dict): A dictionary where keys are task names and values are lists of task dependencies.
     """
-    # Create a directed graph for tasks and dependencies
-    dag = nx.DiGraph()
+    # Count unmet dependencies and record successors in one pass over the input
+    in_degree = {}
+    waiting_tasks = defaultdict(list)
     for task, dependencies in task_dependencies.items():
+        in_degree[task] = in_degree.get(task, 0) + len(dependencies)
         for dep in dependencies:
-            dag.add_edge(dep, task)
-    
-    # Ensure the graph is a DAG
-    if not nx.is_directed_acyclic_graph(dag):
-        raise ValueError("The input graph is not a DAG; topological sorting is not possible.")
-    
+            in_degree.setdefault(dep, 0)
+            waiting_tasks[dep].append(task)
+
+    # Per-task completion counters; next() on itertools.count is atomic in CPython,
+    # so exactly one worker observes a dependent's final dependency finishing
+    finished_deps = {task: itertools.count(1) for task in in_degree}
+
     # Determine initial tasks (those with no dependencies)
-    in_degree = {task: len(list(dag.predecessors(task))) for task in dag.nodes}
     ready_tasks = [task for task, degree in in_degree.items() if degree == 0]
+    if in_degree and not ready_tasks:
+        # Every task waits on another one, so nothing could ever start
+        raise ValueError("The input graph is not a DAG; topological sorting is not possible.")
+
+    # Workers push newly ready tasks, then a completion marker, onto this queue
+    events = queue.SimpleQueue()
+
+    def on_done(completed_task):
+        print(f"Task {completed_task} finished.")
+        for dependent in waiting_tasks[completed_task]:
+            if next(finished_deps[dependent]) == in_degree[dependent]:
+                events.put(dependent)
+        events.put(_TASK_DONE)
 
-    # Dictionary to hold tasks waiting on other tasks
-    waiting_tasks = defaultdict(list)
-    for task in dag.nodes:
-        for successor in dag.successors(task):
-            waiting_tasks[task].append(successor)
-    
     # Use ThreadPoolExecutor to execute tasks concurrently
     with ThreadPoolExecutor() as executor:
-        futures = {executor.submit(execute_task, task): task for task in ready_tasks}
+        def submit(task):
+            future = executor.submit(execute_task, task)
+            future.add_done_callback(lambda _, task=task: on_done(task))
+
+        for task in ready_tasks:
+            submit(task)
         print(f"Initial tasks submitted: {ready_tasks}")
-        
-        while futures:
-            # Process tasks as they complete
-            for future in as_completed(futures):
-                completed_task = futures.pop(future)
-                print(f"Task {completed_task} finished.")
-                
-                # Check if any dependent tasks can now start
-                for dependent in waiting_tasks[completed_task]:
-                    in_degree[dependent] -= 1
-                    if in_degree[dependent] == 0:
-                        print(f"Submitting dependent task: {dependent}")
-                        futures[executor.submit(execute_task, dependent)] = dependent
 
+        scheduled = list(ready_tasks)
+        in_flight = len(scheduled)
+        while in_flight:
+            item = events.get()
+            if item is _TASK_DONE:
+                in_flight -= 1
+            else:
+                print(f"Submitting dependent task: {item}")
+                submit(item)
+                scheduled.append(item)
+                in_flight += 1
+
+    # Tasks on or behind a cycle never reach in-degree zero, so they are never submitted
+    if len(scheduled) != len(in_degree):
+        blocked = set(in_degree).difference(scheduled)
+        raise ValueError(
+            f"The input graph is not a DAG; tasks blocked by a cycle: {sorted(blocked, key=str)}"
+        )
 
 if __name__ == "__main__":
     import time 
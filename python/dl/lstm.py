@@ -1,3 +1,5 @@
+import functools
+
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import r2_score
@@ -13,11 +15,9 @@ data_length = 10000
 data = np.random.randn(data_length)
 
 def create_dataset(data, n_steps_in, n_steps_out):
-    X, y = [], []
-    for i in range(len(data) - n_steps_in - n_steps_out + 1):
-        X.append(data[i:(i + n_steps_in)])
-        y.append(data[(i + n_steps_in):(i + n_steps_in + n_steps_out)])
-    return np.array(X), np.array(y)
+    # Zero-copy view of every (n_steps_in + n_steps_out) window, split into inputs and targets
+    windows = np.lib.stride_tricks.sliding_window_view(data, n_steps_in + n_steps_out)
+    return windows[:, :n_steps_in], windows[:, n_steps_in:]
 
 # Define the input and output sequence length
 n_steps_in, n_steps_out = 60, 5
@@ -32,14 +32,11 @@ class LSTMModel(nn.Module):
 
     @nn.compact
     def __call__(self, x):
-        x = x[:, :, None]  # Add feature dimension
-        lstm_cell = nn.LSTMCell(features=self.hidden_dim)
-        
-        batch_size = x.shape[0]
-        lstm_state = lstm_cell.initialize_carry(jax.random.PRNGKey(0), (batch_size,))
-        
-        for i in range(x.shape[1]):
-            lstm_state, y = lstm_cell(lstm_state, x[:, i, :])
+        x = x[:, :, None].astype(jnp.bfloat16)  # Add feature dimension
+        # Scan the cell over the time axis so XLA sees one loop instead of an unrolled graph.
+        # The recurrence runs in bfloat16; weights stay float32 so Adam updates aren't lost.
+        ys = nn.RNN(nn.LSTMCell(features=self.hidden_dim, dtype=jnp.bfloat16))(x)
+        y = ys[:, -1, :]
         
         return nn.Dense(features=1, dtype=jnp.float32)(y)
 
@@ -55,7 +52,7 @@ learning_rate = 0.001
 rng = jax.random.PRNGKey(0)
 state = create_train_state(rng, learning_rate, hidden_dim)
 
-@jax.jit
+# Scan body of train_epoch: traced inside its jit, so it needs no jit (or donation) of its own
 def train_step(state, batch):
     def loss_fn(params):
         predictions = state.apply_fn({'params': params}, batch[0])
@@ -65,25 +62,42 @@ def train_step(state, batch):
     state = state.apply_gradients(grads=grads)
     return state, loss
 
+@functools.partial(jax.jit, donate_argnums=(0,))
+def train_epoch(state, X_batches, y_batches):
+    # One dispatch per epoch: scan train_step over the leading batch axis
+    return jax.lax.scan(train_step, state, (X_batches, y_batches))
+
 # Training loop
 num_epochs = 50
 batch_size = 32
+n_batches = len(X_train) // batch_size
 
 for epoch in range(num_epochs):
-    # Create a new random permutation of the training data
-    perm = jax.random.permutation(jax.random.PRNGKey(epoch), len(X_train))
-    # Use this permutation to shuffle both X_train and y_train
-    X_train_shuffled = X_train[perm]
-    y_train_shuffled = y_train[perm]
+    # Create a new random permutation of the training data, dropping the ragged tail
+    perm = jax.random.permutation(jax.random.PRNGKey(epoch), len(X_train))[:n_batches * batch_size]
+    # Use this permutation to shuffle both X_train and y_train into fixed-size batches
+    X_batches = X_train[perm].reshape(n_batches, batch_size, n_steps_in)
+    y_batches = y_train[perm].reshape(n_batches, batch_size)
     
-    for i in range(0, len(X_train), batch_size):
-        batch = (X_train_shuffled[i:i+batch_size], y_train_shuffled[i:i+batch_size])
-        state, loss = train_step(state, batch)
+    state, losses = train_epoch(state, X_batches, y_batches)
     
-    print(f"Epoch {epoch}, Loss: {loss}")
+    print(f"Epoch {epoch}, Loss: {losses[-1]}")
+
+eval_batch_size = 256
+eval_model = LSTMModel(hidden_dim=hidden_dim)
+
+@jax.jit
+def predict_batch(params, X):
+    return eval_model.apply({'params': params}, X).squeeze(-1)
 
 def predict(params, X):
-    return LSTMModel(hidden_dim=hidden_dim).apply({'params': params}, X).squeeze()
+    # Pad to a multiple of eval_batch_size so every call hits the same compiled executable
+    n = len(X)
+    n_padded = -(-n // eval_batch_size) * eval_batch_size
+    X_padded = np.zeros((n_padded, X.shape[1]), dtype=X.dtype)
+    X_padded[:n] = X
+    preds = [predict_batch(params, X_padded[i:i+eval_batch_size]) for i in range(0, n_padded, eval_batch_size)]
+    return np.concatenate(preds)[:n]
 
 y_pred = predict(state.params, X_test)
 r2 = r2_score(y_test, y_pred)
@@ -1,7 +1,6 @@
-from automat import MethodicalMachine
-from enum import Enum
+from enum import IntEnum
 
-class MarketDataState(Enum):
+class MarketDataState(IntEnum):
     DISCONNECTED = 1
     CONNECTING = 2
     CONNECTED = 3
@@ -9,74 +8,60 @@ class MarketDataState(Enum):
     SUBSCRIBED = 5
     ERROR = 6
 
+class MarketDataInput(IntEnum):
+    CONNECT = 1
+    CONNECTION_SUCCESS = 2
+    CONNECTION_FAILURE = 3
+    SUBSCRIBE = 4
+    SUBSCRIPTION_SUCCESS = 5
+    SUBSCRIPTION_FAILURE = 6
+    DISCONNECT = 7
+    ERROR_OCCURRED = 8
+
 class MarketDataListener:
-    _machine = MethodicalMachine()
+    __slots__ = ('state', 'subscribed_symbols', 'connection_attempts')
 
     def __init__(self):
-        self.state = MarketDataState.DISCONNECTED
+        self.state = MarketDataState.DISCONNECTED.value
         self.subscribed_symbols = set()
         self.connection_attempts = 0
 
-    @_machine.state(initial=True)
-    def disconnected(self):
-        pass
-
-    @_machine.state()
-    def connecting(self):
-        pass
-
-    @_machine.state()
-    def connected(self):
-        pass
-
-    @_machine.state()
-    def subscribing(self):
-        pass
+    def _dispatch(self, machine_input, *args):
+        # The new state is entered before outputs run, so outputs may feed further inputs
+        try:
+            self.state, output = self._transitions[(self.state, machine_input)]
+        except KeyError:
+            raise ValueError(
+                f"No transition from {MarketDataState(self.state).name} on {MarketDataInput(machine_input).name}"
+            ) from None
+        output(self, *args)
 
-    @_machine.state()
-    def subscribed(self):
-        pass
-
-    @_machine.state()
-    def error(self):
-        pass
-
-    @_machine.input()
     def connect(self):
-        pass
+        self._dispatch(MarketDataInput.CONNECT)
 
-    @_machine.input()
     def connection_success(self):
-        pass
+        self._dispatch(MarketDataInput.CONNECTION_SUCCESS)
 
-    @_machine.input()
     def connection_failure(self):
-        pass
+        self._dispatch(MarketDataInput.CONNECTION_FAILURE)
 
-    @_machine.input()
     def subscribe(self, symbol):
-        pass
+        self._dispatch(MarketDataInput.SUBSCRIBE, symbol)
 
-    @_machine.input()
     def subscription_success(self, symbol):
-        pass
+        self._dispatch(MarketDataInput.SUBSCRIPTION_SUCCESS, symbol)
 
-    @_machine.input()
     def subscription_failure(self, symbol):
-        pass
+        self._dispatch(MarketDataInput.SUBSCRIPTION_FAILURE, symbol)
 
-    @_machine.input()
     def disconnect(self):
-        pass
+        self._dispatch(MarketDataInput.DISCONNECT)
 
-    @_machine.input()
     def error_occurred(self, error_message):
-        pass
+        self._dispatch(MarketDataInput.ERROR_OCCURRED, error_message)
 
-    @_machine.output()
     def _start_connection(self):
         print("Starting connection...")
-        self.state = MarketDataState.CONNECTING
         self.connection_attempts += 1
         # Simulate connection attempt (replace with actual logic)
         if self.connection_attempts < 3:
@@ -84,65 +69,59 @@ class MarketDataListener:
         else:
             self.connection_failure()
 
-    @_machine.output()
     def _handle_connection_success(self):
         print("Connection successful.")
-        self.state = MarketDataState.CONNECTED
         self.connection_attempts = 0
 
-    @_machine.output()
     def _handle_connection_failure(self):
         print("Connection failed.")
-        self.state = MarketDataState.ERROR
 
-    @_machine.output()
     def _start_subscription(self, symbol):
         print(f"Subscribing to {symbol}...")
-        self.state = MarketDataState.SUBSCRIBING
         # Simulate subscription attempt (replace with actual logic)
         if len(self.subscribed_symbols) < 2:
             self.subscription_success(symbol)
         else:
             self.subscription_failure(symbol)
 
-    @_machine.output()
     def _handle_subscription_success(self, symbol):
         print(f"Subscribed to {symbol}.")
-        self.state = MarketDataState.SUBSCRIBED
         self.subscribed_symbols.add(symbol)
 
-    @_machine.output()
     def _handle_subscription_failure(self, symbol):
         print(f"Subscription to {symbol} failed.")
-        self.state = MarketDataState.ERROR
 
-    @_machine.output()
     def _handle_disconnect(self):
         print("Disconnecting...")
-        self.state = MarketDataState.DISCONNECTED
         self.subscribed_symbols.clear()
 
-    @_machine.output()
     def _handle_error(self, error_message):
         print(f"Error: {error_message}")
-        self.state = MarketDataState.ERROR
-
-    disconnected.upon(connect, enter=connecting, outputs=[_start_connection])
-    connecting.upon(connection_success, enter=connected, outputs=[_handle_connection_success])
-    connecting.upon(connection_failure, enter=error, outputs=[_handle_connection_failure])
-    connected.upon(subscribe, enter=subscribing, outputs=[_start_subscription])
-    subscribing.upon(subscription_success, enter=subscribed, outputs=[_handle_subscription_success])
-    subscribing.upon(subscription_failure, enter=error, outputs=[_handle_subscription_failure])
-    subscribed.upon(subscribe, enter=subscribing, outputs=[_start_subscription])
-    subscribed.upon(disconnect, enter=disconnected, outputs=[_handle_disconnect])
-    connected.upon(disconnect, enter=disconnected, outputs=[_handle_disconnect])
-    error.upon(connect, enter=connecting, outputs=[_start_connection])
-    disconnected.upon(error_occurred, enter=error, outputs=[_handle_error])
-    connected.upon(error_occurred, enter=error, outputs=[_handle_error])
-    subscribed.upon(error_occurred, enter=error, outputs=[_handle_error])
-    connecting.upon(error_occurred, enter=error, outputs=[_handle_error])
-    subscribing.upon(error_occurred, enter=error, outputs=[_handle_error])
-    error.upon(disconnect, enter=disconnected, outputs=[_handle_disconnect]) #add this line.
+
+    # (state, input) -> (next state, output)
+    _transitions = {
+        (MarketDataState.DISCONNECTED, MarketDataInput.CONNECT): (MarketDataState.CONNECTING, _start_connection),
+        (MarketDataState.CONNECTING, MarketDataInput.CONNECTION_SUCCESS): (MarketDataState.CONNECTED, _handle_connection_success),
+        (MarketDataState.CONNECTING, MarketDataInput.CONNECTION_FAILURE): (MarketDataState.ERROR, _handle_connection_failure),
+        (MarketDataState.CONNECTED, MarketDataInput.SUBSCRIBE): (MarketDataState.SUBSCRIBING, _start_subscription),
+        (MarketDataState.SUBSCRIBING, MarketDataInput.SUBSCRIPTION_SUCCESS): (MarketDataState.SUBSCRIBED, _handle_subscription_success),
+        (MarketDataState.SUBSCRIBING, MarketDataInput.SUBSCRIPTION_FAILURE): (MarketDataState.ERROR, _handle_subscription_failure),
+        (MarketDataState.SUBSCRIBED, MarketDataInput.SUBSCRIBE): (MarketDataState.SUBSCRIBING, _start_subscription),
+        (MarketDataState.SUBSCRIBED, MarketDataInput.DISCONNECT): (MarketDataState.DISCONNECTED, _handle_disconnect),
+        (MarketDataState.CONNECTED, MarketDataInput.DISCONNECT): (MarketDataState.DISCONNECTED, _handle_disconnect),
+        (MarketDataState.ERROR, MarketDataInput.CONNECT): (MarketDataState.CONNECTING, _start_connection),
+        (MarketDataState.DISCONNECTED, MarketDataInput.ERROR_OCCURRED): (MarketDataState.ERROR, _handle_error),
+        (MarketDataState.CONNECTED, MarketDataInput.ERROR_OCCURRED): (MarketDataState.ERROR, _handle_error),
+        (MarketDataState.SUBSCRIBED, MarketDataInput.ERROR_OCCURRED): (MarketDataState.ERROR, _handle_error),
+        (MarketDataState.CONNECTING, MarketDataInput.ERROR_OCCURRED): (MarketDataState.ERROR, _handle_error),
+        (MarketDataState.SUBSCRIBING, MarketDataInput.ERROR_OCCURRED): (MarketDataState.ERROR, _handle_error),
+        (MarketDataState.ERROR, MarketDataInput.DISCONNECT): (MarketDataState.DISCONNECTED, _handle_disconnect),
+    }
+    # Plain ints in the table keep self.state a plain int; IntEnum inputs hash equal to their values
+    _transitions = {
+        (state.value, machine_input.value): (next_state.value, output)
+        for (state, machine_input), (next_state, output) in _transitions.items()
+    }
 
 # Example usage
 listener = MarketDataListener()
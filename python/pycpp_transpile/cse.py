@@ -1,32 +1,79 @@
 import ast
-import astor
-from collections import defaultdict, deque
-
-# Original code to be optimized
-source_code = """
-x = 4
-y = 5
-z = x * y
-q = x * y
-w = x
-u = w * y
-"""
-
-# Step 1: Parse the source code into an AST
-tree = ast.parse(source_code)
+import functools
+
+def _bound_names(stmt):
+    """Names a statement may bind or unbind anywhere inside it, conservatively."""
+    names = set()
+    for node in ast.walk(stmt):
+        node_type = type(node)
+        if node_type is ast.Name:
+            if type(node.ctx) is not ast.Load:  # Store (incl. AugAssign, for, walrus) or Del
+                names.add(node.id)
+        elif node_type in (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef):
+            names.add(node.name)
+        elif node_type in (ast.Import, ast.ImportFrom):
+            for alias in node.names:
+                names.add(alias.asname or alias.name.partition('.')[0])
+        elif node_type in (ast.Global, ast.Nonlocal):
+            names.update(node.names)
+        elif node_type in (ast.ExceptHandler, ast.MatchAs, ast.MatchStar):
+            if node.name:
+                names.add(node.name)
+        elif node_type is ast.MatchMapping:
+            if node.rest:
+                names.add(node.rest)
+    return names
 
 # Step 2: Perform CSE on the AST
 class CSETransformer(ast.NodeTransformer):
     def __init__(self):
         self.subexprs = {}
-        self.new_assignments = []
+        self.value_numbers = {}
+        self.number_count = 0  # Value numbers handed out so far; never reused
+        self.body = []  # Output statements, in an order where every name is defined before use
+
+    def visit_Module(self, node):
+        # Lower statements in source order: each one is preceded by the subexpr_N
+        # assignments it introduces, so the output needs no topological sort afterwards
+        for stmt in node.body:
+            if isinstance(stmt, ast.Assign):
+                stmt = self.visit(stmt)
+            else:
+                # Passed through unvisited, but any name it may bind gets a new value
+                self.rebind(_bound_names(stmt))
+            self.body.append(stmt)
+        node.body = self.body
+        return node
+
+    def value_number(self, node):
+        # Operands are leaves here since nested BinOps were already replaced by Names
+        if isinstance(node, ast.Name):
+            leaf = ('N', node.id)
+        elif isinstance(node, ast.Constant):
+            leaf = ('C', type(node.value), node.value)
+        else:
+            leaf = ('D', id(node))  # Opaque operand: only equal to itself
+        number = self.value_numbers.get(leaf)
+        if number is None:
+            number = self.value_numbers[leaf] = self.fresh_number()
+        return number
+
+    def fresh_number(self):
+        self.number_count += 1
+        return self.number_count
+
+    def rebind(self, names):
+        # A stored name holds a new value: give it a fresh number, so subexpressions keyed
+        # on the old one are never matched again
+        for name in names:
+            self.value_numbers[('N', name)] = self.fresh_number()
 
     def visit_BinOp(self, node):
         # Visit the left and right to get the optimized nodes
         self.generic_visit(node)
 
-        # Create a unique key for the subexpression
-        key = (type(node.op), ast.dump(node.left), ast.dump(node.right))
+        # Key the subexpression by the value numbers of its operands
+        key = (type(node.op), self.value_number(node.left), self.value_number(node.right))
 
         if key in self.subexprs:
             # If the subexpression has already been seen, replace it with the variable
@@ -39,64 +86,53 @@ class CSETransformer(ast.NodeTransformer):
             # Create a new assignment for the subexpression
             new_assign = ast.Assign(targets=[ast.Name(id=var_name, ctx=ast.Store())],
                                     value=node)
-            self.new_assignments.append(new_assign)
+            self.body.append(new_assign)
             return ast.Name(id=var_name, ctx=ast.Load())
 
     def visit_Assign(self, node):
         # Transform the right-hand side of the assignment
         self.generic_visit(node)
+        # The targets (and any walrus in the value) are rebound from here on
+        self.rebind(_bound_names(node))
         return node
 
-# Create an instance of the transformer and optimize the AST
-transformer = CSETransformer()
-optimized_tree = transformer.visit(tree)
-
-# Step 3: Collect dependencies
-dependencies = defaultdict(set)
-assignment_map = {}
-
-# Track dependencies for each assignment
-for node in optimized_tree.body + transformer.new_assignments:
-    if isinstance(node, ast.Assign):
-        target = node.targets[0].id
-        # Extract variables on the RHS
-        used_vars = {n.id for n in ast.walk(node.value) if isinstance(n, ast.Name)}
-        dependencies[target].update(used_vars)
-        assignment_map[target] = node
-
-# Step 4: Build the dependency graph and perform a topological sort
-# Calculate in-degrees and construct graph
-in_degree = defaultdict(int)
-graph = defaultdict(list)
-
-for var, deps in dependencies.items():
-    for dep in deps:
-        graph[dep].append(var)
-        in_degree[var] += 1
-
-# Topological sort using Kahn's algorithm
-sorted_assignments = []
-queue = deque([node for node in assignment_map if in_degree[node] == 0])
-
-while queue:
-    var = queue.popleft()
-    sorted_assignments.append(assignment_map[var])
-    for neighbor in graph[var]:
-        in_degree[neighbor] -= 1
-        if in_degree[neighbor] == 0:
-            queue.append(neighbor)
-
-# Step 5: Compile the optimized AST back to code in sorted order
-optimized_tree.body = sorted_assignments
-
-# Step 6: Generate and print the optimized code
-optimized_code = astor.to_source(optimized_tree)
-print("Optimized Code:\n", optimized_code)
-
-# Step 7: Execute the optimized code
-exec_locals = {}
-exec(optimized_code, {}, exec_locals)
-
-# Print results of the executed code
-for key, value in exec_locals.items():
-    print(f"{key} = {value}")
+@functools.lru_cache(maxsize=128)
+def optimize(source_code):
+    """Run CSE over source_code and return (optimized source, code object)."""
+    # Step 1: Parse the source code into an AST
+    tree = ast.parse(source_code)
+
+    # Create an instance of the transformer and optimize the AST; the new body is
+    # already in dependency order
+    transformer = CSETransformer()
+    optimized_tree = transformer.visit(tree)
+
+    # Step 3: Generate the optimized code and compile it once
+    ast.fix_missing_locations(optimized_tree)
+    optimized_code = ast.unparse(optimized_tree)
+    return optimized_code, compile(optimized_tree, '<cse>', 'exec')
+
+def _demo():
+    # Original code to be optimized
+    source_code = """
+x = 4
+y = 5
+z = x * y
+q = x * y
+w = x
+u = w * y
+"""
+
+    optimized_code, code_obj = optimize(source_code)
+    print("Optimized Code:\n", optimized_code)
+
+    # Step 4: Execute the optimized code
+    exec_locals = {}
+    exec(code_obj, {}, exec_locals)
+
+    # Print results of the executed code
+    for key, value in exec_locals.items():
+        print(f"{key} = {value}")
+
+if __name__ == "__main__":
+    _demo()
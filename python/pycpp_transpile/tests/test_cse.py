@@ -0,0 +1,38 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cse
+
+
+class RebindingTest(unittest.TestCase):
+    def assertSameAsPython(self, source_code, *names):
+        expected = {}
+        exec(source_code, expected)
+        env = {}
+        exec(cse.optimize(source_code)[1], env)
+        for name in names:
+            self.assertEqual(env[name], expected[name], name)
+
+    def test_common_subexpression_is_shared(self):
+        optimized_code, _ = cse.optimize("x = 2\ny = 3\na = x * y\nb = x * y\n")
+        self.assertEqual(optimized_code.count("x * y"), 1)
+
+    def test_assignment_invalidates_subexpression(self):
+        self.assertSameAsPython("x = 2\ny = 3\na = x * y\nx = 10\nb = x * y\n", "a", "b")
+
+    def test_self_referencing_assignment(self):
+        self.assertSameAsPython("x = 2\ny = 3\nx = x * y\nb = x * y\n", "x", "b")
+
+    def test_passed_through_statements_invalidate(self):
+        self.assertSameAsPython(
+            "x = 2\ny = 3\na = x * y\nx += 1\nb = x * y\n"
+            "for y in range(5):\n    pass\nc = x * y\n",
+            "a", "b", "c",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vn
+
+
+def run(source_code, exports=None):
+    _, code_obj = vn.optimize(source_code, exports)
+    env = {}
+    exec(code_obj, env)
+    return env
+
+
+class ExportsTest(unittest.TestCase):
+    def test_exports_accepts_a_list(self):
+        env = run("a = 2\nb = a * 3\nc = b + 1\n", ["c"])
+        self.assertEqual(env["c"], 7)
+
+    def test_equal_export_sets_share_a_memo_entry(self):
+        source_code = "p = 5\nq = p * p\n"
+        vn.optimize(source_code, ["q"])
+        hits = vn._cache_info().hits
+        vn.optimize(source_code, ("q",))
+        self.assertEqual(vn._cache_info().hits, hits + 1)
+
+    def test_augmented_assignment_keeps_its_input(self):
+        # x is not exported, but x += 1 still reads the x = 1 before it
+        env = run("x = 1\nx += 1\nz = 3\n", ["z"])
+        self.assertEqual(env["z"], 3)
+
+
+class RebindingTest(unittest.TestCase):
+    def assertSameAsPython(self, source_code, *names):
+        expected = {}
+        exec(source_code, expected)
+        env = run(source_code)
+        for name in names:
+            self.assertEqual(env[name], expected[name], name)
+
+    def test_augmented_assignment_invalidates_constant(self):
+        self.assertSameAsPython("x = 1\nx += 1\ny = x * 2\n", "y")
+
+    def test_conditional_assignment_invalidates_constant(self):
+        self.assertSameAsPython("c = True\nx = 1\nif c:\n    x = 5\ny = x * 2\n", "y")
+
+    def test_loop_assignment_invalidates_constant(self):
+        self.assertSameAsPython("s = 0\nfor i in range(3):\n    s = s + i * 2\nt = s + 1\n", "t")
+
+    def test_rebinding_invalidates_subexpression(self):
+        self.assertSameAsPython("x = len('ab')\ny = 3\na = x * y\nx = len('abc')\nb = x * y\n", "a", "b")
+
+    def test_rebinding_invalidates_alias(self):
+        self.assertSameAsPython("x = len('ab')\nw = x\nx = 7\nu = w * 3\n", "u")
+
+    def test_other_binding_statements_invalidate(self):
+        self.assertSameAsPython(
+            "math = 1\nimport math\nf = 2\ndef f():\n    return 0\n"
+            "n = 1\ny = [n := 4]\na = math.floor(1.5) + 0\nb = n * 2\nc = f() + 1\n",
+            "a", "b", "c",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
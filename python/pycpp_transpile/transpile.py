@@ -20,34 +20,58 @@ operator_mapping = {
 def map_type(python_type):
     return type_mapping.get(python_type, python_type)
 
-def transpile(node):
-    if isinstance(node, ast.FunctionDef):
-        return f"{map_type(node.returns.id)} {node.name}({', '.join([f'{map_type(arg.annotation.id)} {arg.arg}' for arg in node.args.args])}) {{\n" + \
-               ''.join(transpile(child) for child in node.body) + "}\n"
-
-    elif isinstance(node, ast.Return):
-        return f"    return {transpile(node.value)};\n"
-
-    elif isinstance(node, ast.BinOp):
-        return f"{transpile(node.left)} {operator_mapping[type(node.op)]} {transpile(node.right)}"
-
-    elif isinstance(node, ast.Constant):
-        return str(node.n)
+# Emitters append C++ fragments to a shared list so the source is joined only once
+def _emit_function_def(node, out):
+    params = ', '.join(f'{map_type(arg.annotation.id)} {arg.arg}' for arg in node.args.args)
+    out.append(f"{map_type(node.returns.id)} {node.name}({params}) {{\n")
+    for child in node.body:
+        _emit(child, out)
+    out.append("}\n")
+
+def _emit_return(node, out):
+    out.append("    return ")
+    _emit(node.value, out)
+    out.append(";\n")
+
+def _emit_binop(node, out):
+    _emit(node.left, out)
+    out.append(f" {operator_mapping[type(node.op)]} ")
+    _emit(node.right, out)
+
+def _emit_constant(node, out):
+    out.append(str(node.value))
+
+def _emit_name(node, out):
+    out.append(node.id)
+
+# Dispatch on the exact node type with a single dict lookup
+_emitters = {
+    ast.FunctionDef: _emit_function_def,
+    ast.Return: _emit_return,
+    ast.BinOp: _emit_binop,
+    ast.Constant: _emit_constant,
+    ast.Name: _emit_name,
+}
 
-    elif isinstance(node, ast.Name):
-        return node.id
+def _emit(node, out):
+    emitter = _emitters.get(type(node))
+    if emitter:
+        emitter(node, out)
 
-    return ""
+def transpile(node):
+    out = []
+    _emit(node, out)
+    return ''.join(out)
 
 def transpile_code(user_code):
     parsed_code = ast.parse(user_code)
-    cpp_code = ""
+    out = []
 
     # Generate C++ code
     for node in parsed_code.body:
-        cpp_code += transpile(node)
+        _emit(node, out)
 
-    return cpp_code
+    return ''.join(out)
 
 def compile_and_execute(cpp_code):
     import cppyy
@@ -1,132 +1,304 @@
 import ast
-import astor
-from collections import defaultdict, deque
+import functools
+import operator
+import sys
 
-# Original code to be optimized
-source_code = """
-x = 4
-y = 5
-z = x * y
-q = x * y
-w = x
-u = w * y
-"""
-
-# Step 1: Parse the source code into an AST
-tree = ast.parse(source_code)
+# Operators folded at compile time; Pow is left out so folding cannot blow up the output
+_FOLDABLE_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+_NUMERIC_TYPES = (int, float, complex)
+_UNKNOWN = object()
+_LEAF_TYPES = (ast.Name, ast.Constant)
+# Interned value_N names shared by every transformer, so repeated runs reuse the same strings
+_VALUE_NAMES = []
 
 # Step 2: Define the Value Numbering Transformer
-class ValueNumberingTransformer(ast.NodeTransformer):
+class ValueNumberingTransformer:
+    # Expression contexts are stateless, so one instance of each is shared by all new Names
+    _LOAD = ast.Load()
+    _STORE = ast.Store()
+
     def __init__(self):
         self.subexprs = {}
         self.var_subs = {}  # Track direct variable assignments (e.g., w = x)
-        self.new_assignments = []
+        self.const_env = {}  # Names currently bound to a numeric constant
+        self.body = []  # Output statements, in an order where every name is defined before use
         self.value_counter = 0
+        self._keys = {}  # id(node) -> (node, structural key)
+        self._keys_by_name = {}  # name -> keys in subexprs that read it
 
     def get_value_name(self):
-        # Generate a new unique variable name
-        var_name = f"value_{self.value_counter}"
+        # Hand out the next name from the shared pool, growing it only past its high-water mark
+        i = self.value_counter
         self.value_counter += 1
-        return var_name
+        while len(_VALUE_NAMES) <= i:
+            _VALUE_NAMES.append(sys.intern(f"value_{len(_VALUE_NAMES)}"))
+        return _VALUE_NAMES[i]
+
+    def _key(self, node):
+        # Structural key built from primitives, memoised by node identity
+        cached = self._keys.get(id(node))
+        if cached is not None:
+            return cached[1]
+        node_type = type(node)
+        if node_type is ast.BinOp:
+            key = (type(node.op), self._key(node.left), self._key(node.right))
+        elif node_type is ast.Name:
+            key = ('N', node.id)
+        elif node_type is ast.Constant:
+            key = ('C', node.value, type(node.value))
+        else:
+            key = ('D', id(node))  # Opaque operand: only equal to itself
+        # Hold on to the node so its id cannot be reused while the key is cached
+        self._keys[id(node)] = (node, key)
+        return key
 
-    def visit_BinOp(self, node):
-        # Visit the left and right to get the optimized nodes
-        self.generic_visit(node)
+    def _invalidate(self, names):
+        # Forget everything known about names that a statement rebinds
+        for name in names:
+            self.const_env.pop(name, None)
+            self.var_subs.pop(name, None)
+            for key in self._keys_by_name.pop(name, ()):
+                self.subexprs.pop(key, None)
+        # Aliases of a rebound name (w = x, then x changes) no longer hold
+        stale = [target for target, source in self.var_subs.items() if source in names]
+        for target in stale:
+            del self.var_subs[target]
+
+    def _constant(self, node):
+        # Compile-time numeric value of an operand, or _UNKNOWN
+        node_type = type(node)
+        if node_type is ast.Constant:
+            value = node.value
+        elif node_type is ast.Name:
+            value = self.const_env.get(node.id, _UNKNOWN)
+        else:
+            return _UNKNOWN
+        return value if type(value) in _NUMERIC_TYPES else _UNKNOWN
+
+    def transform(self, module):
+        # Lower the module in one linear pass: each statement is preceded by the value_N
+        # assignments it introduces, so the output needs no reordering afterwards
+        for stmt in module.body:
+            if type(stmt) is ast.Assign:
+                self.visit_Assign(stmt)
+            else:
+                # Passed through unvisited, but any name it may bind invalidates what we know
+                self._invalidate(_bound_names(stmt))
+            self.body.append(stmt)
+        module.body = self.body
+        return module
+
+    def visit_expr(self, root, _BinOp=ast.BinOp, _leaves=(ast.Name, ast.Constant)):
+        # Iterative post-order over nested BinOps: operands are rewritten before their parent
+        results = []
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            node_type = type(node)
+            if node_type is not _BinOp:
+                results.append(node if node_type in _leaves else self.visit_children(node))
+            elif not expanded:
+                stack.append((node, True))
+                stack.append((node.right, False))
+                stack.append((node.left, False))
+            else:
+                node.right = results.pop()
+                node.left = results.pop()
+                results.append(self.visit_BinOp(node))
+        return results.pop()
+
+    def visit_children(self, node):
+        # Slow path for other expressions (calls, unary ops, ...) that may wrap BinOps
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, list):
+                value[:] = [self.visit_expr(item) if isinstance(item, ast.expr) else item for item in value]
+            elif isinstance(value, ast.expr):
+                setattr(node, field, self.visit_expr(value))
+        return node
+
+    def visit_BinOp(self, node, _Name=ast.Name, _Assign=ast.Assign):
+        # Operands have already been rewritten by visit_expr
 
         # Substitute variables if there's a direct assignment
-        if isinstance(node.left, ast.Name) and node.left.id in self.var_subs:
-            node.left = ast.Name(id=self.var_subs[node.left.id], ctx=ast.Load())
-        if isinstance(node.right, ast.Name) and node.right.id in self.var_subs:
-            node.right = ast.Name(id=self.var_subs[node.right.id], ctx=ast.Load())
+        # (one dict probe per operand; a new Name is only built when the id actually changes)
+        var_subs = self.var_subs
+        match node.left:
+            case ast.Name(id=name):
+                sub = var_subs.get(name)
+                if sub is not None and sub != name:
+                    node.left = _Name(id=sub, ctx=self._LOAD)
+        match node.right:
+            case ast.Name(id=name):
+                sub = var_subs.get(name)
+                if sub is not None and sub != name:
+                    node.right = _Name(id=sub, ctx=self._LOAD)
+
+        # Fold the operation if both operands are known constants
+        fold = _FOLDABLE_OPS.get(type(node.op))
+        if fold is not None:
+            left, right = self._constant(node.left), self._constant(node.right)
+            if left is not _UNKNOWN and right is not _UNKNOWN:
+                try:
+                    return ast.Constant(value=fold(left, right))
+                except ArithmeticError:
+                    pass  # e.g. division by zero: leave it to raise at run time
 
-        # Create a unique key for the subexpression
-        key = (type(node.op), ast.dump(node.left), ast.dump(node.right))
+        # Create a structural key for the subexpression
+        key = self._key(node)
 
         if key in self.subexprs:
             # If the subexpression has already been seen, replace it with the variable
-            return ast.Name(id=self.subexprs[key], ctx=ast.Load())
+            return _Name(id=self.subexprs[key], ctx=self._LOAD)
         else:
             # If it's a new subexpression, create a new variable name
             var_name = self.get_value_name()
             self.subexprs[key] = var_name
+            for name in _key_names(key):
+                self._keys_by_name.setdefault(name, []).append(key)
 
             # Create a new assignment for the subexpression
-            new_assign = ast.Assign(targets=[ast.Name(id=var_name, ctx=ast.Store())],
-                                    value=node)
-            self.new_assignments.append(new_assign)
-            return ast.Name(id=var_name, ctx=ast.Load())
+            new_assign = _Assign(targets=[_Name(id=var_name, ctx=self._STORE)],
+                                 value=node)
+            self.body.append(new_assign)
+            return _Name(id=var_name, ctx=self._LOAD)
+
+    def visit_Assign(self, node, _Name=ast.Name):
+        # Transform the right-hand side (and any non-Name targets) of the assignment
+        node.targets = [t if type(t) is _Name else self.visit_expr(t) for t in node.targets]
+        node.value = self.visit_expr(node.value)
+
+        # The targets (and any walrus in the value) are rebound from here on
+        self._invalidate(_bound_names(node))
 
-    def visit_Assign(self, node):
         # If it's a direct assignment (like w = x), store it in var_subs
-        if isinstance(node.value, ast.Name) and len(node.targets) == 1:
-            target = node.targets[0]
-            if isinstance(target, ast.Name):
-                self.var_subs[target.id] = node.value.id
+        match node:
+            case ast.Assign(targets=[ast.Name(id=target)], value=ast.Name(id=source)) if target != source:
+                self.var_subs[target] = source
 
-        # Transform the right-hand side of the assignment
-        self.generic_visit(node)
+        # Propagate constants to later statements; any other value invalidates the binding
+        for target in node.targets:
+            if type(target) is _Name:
+                if type(node.value) is ast.Constant:
+                    self.const_env[target.id] = node.value.value
+                else:
+                    self.const_env.pop(target.id, None)
         return node
 
-# Step 3: Optimize the AST with Value Numbering
-transformer = ValueNumberingTransformer()
-optimized_tree = transformer.visit(tree)
-
-# Collect original assignments and newly created subexpression assignments
-original_assignments = []
-for node in optimized_tree.body:
-    if isinstance(node, ast.Assign):
-        # Check if the assignment is to a constant
-        if isinstance(node.targets[0], ast.Name) and isinstance(node.value, (ast.Num, ast.Constant)):
-            original_assignments.append(node)
-
-# Collect all new assignments for common subexpressions
-subexpr_assignments = [assign for assign in transformer.new_assignments]
-
-# Step 4: Dependency graph analysis for assignment ordering
-dependencies = defaultdict(set)
-assignment_map = {}
-
-# Collect dependencies for each assignment
-for node in optimized_tree.body + subexpr_assignments:
-    if isinstance(node, ast.Assign):
-        target = node.targets[0].id
-        # Find dependencies in the right-hand side (RHS) of the assignment
-        used_vars = {n.id for n in ast.walk(node.value) if isinstance(n, ast.Name)}
-        dependencies[target].update(used_vars)
-        assignment_map[target] = node
-
-# Calculate in-degrees and construct graph
-in_degree = defaultdict(int)
-graph = defaultdict(list)
-
-for var, deps in dependencies.items():
-    for dep in deps:
-        graph[dep].append(var)
-        in_degree[var] += 1
-
-# Topological sort using Kahn's algorithm
-sorted_assignments = []
-queue = deque([node for node in assignment_map if in_degree[node] == 0])
-
-while queue:
-    var = queue.popleft()
-    sorted_assignments.append(assignment_map[var])
-    for neighbor in graph[var]:
-        in_degree[neighbor] -= 1
-        if in_degree[neighbor] == 0:
-            queue.append(neighbor)
-
-# Step 5: Compile the optimized AST back to code in sorted order
-optimized_tree.body = sorted_assignments
-
-# Step 6: Generate and print the optimized code
-optimized_code = astor.to_source(optimized_tree)
-print("Optimized Code:\n", optimized_code)
-
-# Step 7: Execute the optimized code
-exec_locals = {}
-exec(optimized_code, {}, exec_locals)
-
-# Print results of the executed code
-for key, value in exec_locals.items():
-    print(f"{key} = {value}")
+def _key_names(key):
+    # Variable names a structural key from _key() refers to
+    if key[0] == 'N':
+        yield key[1]
+    elif key[0] not in ('C', 'D'):
+        for part in key[1:]:
+            yield from _key_names(part)
+
+def _bound_names(stmt):
+    """Names a statement may bind or unbind anywhere inside it, conservatively."""
+    names = set()
+    for node in ast.walk(stmt):
+        node_type = type(node)
+        if node_type is ast.Name:
+            if type(node.ctx) is not ast.Load:  # Store (incl. AugAssign, for, walrus) or Del
+                names.add(node.id)
+        elif node_type in (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef):
+            names.add(node.name)
+        elif node_type in (ast.Import, ast.ImportFrom):
+            for alias in node.names:
+                names.add(alias.asname or alias.name.partition('.')[0])
+        elif node_type in (ast.Global, ast.Nonlocal):
+            names.update(node.names)
+        elif node_type in (ast.ExceptHandler, ast.MatchAs, ast.MatchStar):
+            if node.name:
+                names.add(node.name)
+        elif node_type is ast.MatchMapping:
+            if node.rest:
+                names.add(node.rest)
+    return names
+
+def _is_pure(value):
+    # Values of the lowered straight-line IR: leaves, or a BinOp over leaves
+    if type(value) is ast.BinOp:
+        return type(value.left) in _LEAF_TYPES and type(value.right) in _LEAF_TYPES
+    return type(value) in _LEAF_TYPES
+
+def eliminate_dead_code(body, live):
+    """Drop pure assignments whose targets are not in `live` afterwards, in one reverse pass."""
+    kept = []
+    for stmt in reversed(body):
+        if type(stmt) is ast.Assign:
+            names = [t.id for t in stmt.targets if type(t) is ast.Name]
+            if len(names) == len(stmt.targets) and _is_pure(stmt.value) and live.isdisjoint(names):
+                continue
+            live.difference_update(names)
+        kept.append(stmt)
+        live.update(n.id for n in ast.walk(stmt) if type(n) is ast.Name and type(n.ctx) is ast.Load)
+        # An augmented assignment reads its target before rebinding it
+        live.update(n.target.id for n in ast.walk(stmt) if type(n) is ast.AugAssign and type(n.target) is ast.Name)
+    kept.reverse()
+    return kept
+
+def optimize(source_code, exports=None):
+    """
+    Run value numbering over source_code and return (optimized source, code object).
+
+    `exports` is an iterable of names that must survive dead-code elimination;
+    by default every name the source assigns is kept.
+    """
+    # Normalised so any iterable works and equal name sets share one memo entry
+    return _optimize(source_code, None if exports is None else frozenset(exports))
+
+@functools.lru_cache(maxsize=256)
+def _optimize(source_code, exports):
+    # Step 1: Parse the source code into an AST
+    tree = ast.parse(source_code)
+    if exports is None:
+        exports = [t.id for stmt in tree.body if type(stmt) is ast.Assign
+                   for t in stmt.targets if type(t) is ast.Name]
+
+    # Step 3: Optimize the AST with Value Numbering; the new body is already in dependency order
+    transformer = ValueNumberingTransformer()
+    optimized_tree = transformer.transform(tree)
+
+    # Remove assignments nothing reads any more
+    optimized_tree.body = eliminate_dead_code(optimized_tree.body, set(exports))
+
+    # Step 4: Generate the optimized code and compile it once
+    ast.fix_missing_locations(optimized_tree)
+    optimized_code = ast.unparse(optimized_tree)
+    return optimized_code, compile(optimized_tree, '<cse>', 'exec')
+
+def _cache_info():
+    # Hit/miss counters of the optimize() memo, for observability
+    return _optimize.cache_info()
+
+def _demo():
+    # Original code to be optimized
+    source_code = """
+x = 4
+y = 5
+z = x * y
+q = x * y
+w = x
+u = w * y
+"""
+
+    optimized_code, code_obj = optimize(source_code)
+    print("Optimized Code:\n", optimized_code)
+
+    # Step 5: Execute the optimized code
+    exec_locals = {}
+    exec(code_obj, {}, exec_locals)
+
+    # Print results of the executed code
+    for key, value in exec_locals.items():
+        print(f"{key} = {value}")
+
+if __name__ == "__main__":
+    _demo()
@@ -2,8 +2,13 @@ import time
 from typing import Dict, List, Callable, Any, Optional, Tuple, Set, Union
 import logging
 from enum import Enum
-from collections import defaultdict
+from collections import deque
+from array import array
 import functools
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -12,6 +17,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Per-node logging in the hot paths (compute, set_value, reset) is skipped unless this is set
+_DEBUG = False
+
+def set_debug(flag: bool) -> None:
+    """Turn per-node computation logging on or off."""
+    global _DEBUG
+    _DEBUG = flag
+
+# Marks a node without an active override (None is a legitimate override value)
+_NO_OVERRIDE = object()
+
+class _SkipCompute(Exception):
+    """Raised by a node function to leave the node uncomputed, as a None dependency does."""
+
 class ExecutionMode(Enum):
     """Execution strategies for task nodes"""
     EAGER = "eager"     # Compute as soon as dependencies are satisfied
@@ -25,6 +44,14 @@ class TaskNode:
     Each node can be eager (computed during traversal) or lazy (computed on demand),
     and tracks its dependencies and dependents to maintain the reactive graph structure.
     """
+    # Fixed attribute layout: no per-instance __dict__, and slot access on the hot paths
+    __slots__ = (
+        'name', 'func', 'dependencies', 'dependents', 'mode', 'can_set',
+        'result', 'is_computed', 'is_dirty', '_override_value', '_override_stack',
+        '_dep_getters', '_debug_delay', '_lock',
+        '_is_eager', '_is_lazy_or_cached', '__weakref__',
+    )
+    
     def __init__(
         self, 
         name: str, 
@@ -46,19 +73,36 @@ class TaskNode:
         self.name = name
         self.func = func
         self.dependencies = dependencies or []
-        self.dependents = []
+        # Back-edges are weak so a dependent nobody else references can be freed without the cycle GC
+        self.dependents = weakref.WeakSet()
         self.mode = mode
         self.can_set = can_set
         
+        # Mode tests precomputed as plain booleans for the hot paths
+        self._is_eager = mode == ExecutionMode.EAGER
+        self._is_lazy_or_cached = mode in (ExecutionMode.LAZY, ExecutionMode.CACHED)
+        
         # Node state
         self.result = None
         self.is_computed = False
         self.is_dirty = True
-        self._override_stack = []
+        self._override_value = _NO_OVERRIDE  # Innermost active override
+        self._override_stack = None  # Shadowed outer overrides, only allocated when nested
+        self._lock = threading.Lock()  # Held while computing, so concurrent callers compute once
+        self._debug_delay = 0  # Seconds to sleep before each computation; see DAGRegistry(debug_delay=...)
+        
+        # Bound getters of the dependencies, in argument order
+        self._dep_getters = tuple(dep.get_value for dep in self.dependencies)
         
         # Register this node as a dependent of each dependency
         for dep in self.dependencies:
-            dep.dependents.append(self)
+            dep.dependents.add(self)
+            
+        # Switch to the subclass whose compute is specialized for this arity, if there is one
+        if type(self) is TaskNode:
+            specialized = self._specialized_class(len(self.dependencies))
+            if specialized is not None:
+                self.__class__ = specialized
 
     def compute(self, force: bool = False) -> Any:
         """
@@ -74,27 +118,129 @@ class TaskNode:
         if not force and not self.is_dirty and self.is_computed:
             return self.result
             
-        # Get dependency values
-        dependency_values = [dep.get_value() for dep in self.dependencies]
-        
-        # Check if any dependencies returned None
-        if any(val is None for val in dependency_values):
-            logger.debug(f"Node '{self.name}': dependency returned None, skipping computation.")
-            return None
+        with self._lock:
+            # Another thread may have finished computing this node while we waited
+            if not force and not self.is_dirty and self.is_computed:
+                return self.result
+                
+            # Get dependency values, stopping at the first dependency that returns None
+            dependency_values = []
+            append = dependency_values.append
+            for get_value in self._dep_getters:
+                val = get_value()
+                if val is None:
+                    if _DEBUG:
+                        logger.debug("Node '%s': dependency returned None, skipping computation.", self.name)
+                    return None
+                append(val)
             
-        # Log what's happening
-        logger.info(f"Computing: Node '{self.name}' ({self.mode.value}) with inputs: {dependency_values}")
+            # Log what's happening
+            if _DEBUG:
+                logger.info("Computing: Node '%s' (%s) with inputs: %s", self.name, self.mode.value, dependency_values)
         
-        # Small delay to make execution order clearer in logs
-        time.sleep(0.05)
+            # Optional delay to make execution order clearer in logs
+            if self._debug_delay:
+                time.sleep(self._debug_delay)
         
-        # Compute the result
-        self.result = self.func(*dependency_values)
-        self.is_computed = True
-        self.is_dirty = False
+            # Compute the result
+            try:
+                self.result = self.func(*dependency_values)
+            except _SkipCompute:
+                return None
+            self.is_computed = True
+            self.is_dirty = False
         
-        logger.info(f"Completed: Node '{self.name}' → {self.result}")
-        return self.result
+            if _DEBUG:
+                logger.info("Completed: Node '%s' → %s", self.name, self.result)
+            return self.result
+
+    # Arity -> TaskNode subclass with a generated compute; larger arities use the generic compute
+    _MAX_SPECIALIZED_ARITY = 8
+    _class_by_arity: Dict[int, type] = {}
+
+    @classmethod
+    def _specialized_class(cls, arity: int) -> Optional[type]:
+        """
+        Get (building once per arity) a subclass whose compute is _make_compute(arity).
+        
+        Nodes switch their __class__ to it, so the specialized method is found on the
+        type and no per-instance bound method ties the node into a reference cycle.
+        
+        Args:
+            arity: Number of dependencies of the node
+            
+        Returns:
+            The subclass, or None above the size limit
+        """
+        specialized = cls._class_by_arity.get(arity)
+        if specialized is None:
+            compute = cls._make_compute(arity)
+            if compute is None:
+                return None
+            # Named per arity so reprs and tracebacks tell the subclasses apart
+            name = f"{cls.__name__}{arity}"
+            specialized = cls._class_by_arity[arity] = type(
+                name, (cls,), {"__slots__": (), "__module__": cls.__module__, "__qualname__": name, "compute": compute}
+            )
+        return specialized
+
+    @classmethod
+    def _make_compute(cls, arity: int) -> Optional[Callable]:
+        """
+        Build a compute function with the dependency calls unrolled.
+        
+        The generated body mirrors compute() but passes the dependency values as
+        positional arguments instead of packing them into a list.
+        
+        Args:
+            arity: Number of dependencies of the node
+            
+        Returns:
+            The function, or None above the size limit
+        """
+        if arity > cls._MAX_SPECIALIZED_ARITY:
+            return None
+            
+        args = ", ".join(f"a{i}" for i in range(arity))
+        lines = [
+            "def compute(self, force=False):",
+            "    if not force and not self.is_dirty and self.is_computed:",
+            "        return self.result",
+        ]
+        lines += [
+            "    with self._lock:",
+            "        if not force and not self.is_dirty and self.is_computed:",
+            "            return self.result",
+        ]
+        if arity:
+            lines.append(f"        {', '.join(f'g{i}' for i in range(arity))}, = self._dep_getters")
+        for i in range(arity):
+            lines += [
+                f"        a{i} = g{i}()",
+                f"        if a{i} is None:",
+                "            if _DEBUG:",
+                "                logger.debug(\"Node '%s': dependency returned None, skipping computation.\", self.name)",
+                "            return None",
+            ]
+        lines += [
+            "        if _DEBUG:",
+            f"            logger.info(\"Computing: Node '%s' (%s) with inputs: %s\", self.name, self.mode.value, [{args}])",
+            "        if self._debug_delay:",
+            "            time.sleep(self._debug_delay)",
+            "        try:",
+            f"            self.result = result = self.func({args})",
+            "        except _SkipCompute:",
+            "            return None",
+            "        self.is_computed = True",
+            "        self.is_dirty = False",
+            "        if _DEBUG:",
+            "            logger.info(\"Completed: Node '%s' → %s\", self.name, result)",
+            "        return result",
+        ]
+        # Module globals, so the generated code sees the live _DEBUG flag
+        namespace = {}
+        exec(compile("\n".join(lines), f"<TaskNode.compute/{arity}>", "exec"), globals(), namespace)
+        return namespace["compute"]
 
     def get_value(self) -> Any:
         """
@@ -103,12 +249,17 @@ class TaskNode:
         Returns:
             The computed result of the node
         """
-        # Check for override values first
-        if self._override_stack:
-            return self._override_stack[-1]
+        # Override values take precedence; a single identity check in the common case
+        override = self._override_value
+        if override is not _NO_OVERRIDE:
+            return override
+            
+        # Fast path: a clean node just hands back its result
+        if not self.is_dirty:
+            return self.result
             
         # For lazy and cached nodes, compute only when needed and dirty
-        if self.is_dirty and (self.mode == ExecutionMode.LAZY or self.mode == ExecutionMode.CACHED):
+        if self._is_lazy_or_cached:
             self.compute()
             
         return self.result
@@ -126,7 +277,8 @@ class TaskNode:
         if not self.can_set:
             raise ValueError(f"Cannot set value on immutable node '{self.name}'")
             
-        logger.info(f"Setting value on node '{self.name}': {value}")
+        if _DEBUG:
+            logger.info("Setting value on node '%s': %s", self.name, value)
         self.result = value
         self.is_computed = True
         self.is_dirty = False
@@ -146,36 +298,56 @@ class TaskNode:
 
         class OverrideContext:
             def __enter__(self):
-                node._override_stack.append(temp_value)
+                if node._override_value is not _NO_OVERRIDE:
+                    # Nested override: keep the outer value to restore on exit
+                    if node._override_stack is None:
+                        node._override_stack = []
+                    node._override_stack.append(node._override_value)
+                node._override_value = temp_value
                 node.mark_dependents_dirty()
                 return node
 
             def __exit__(self, exc_type, exc_val, exc_tb):
-                node._override_stack.pop()
+                node._override_value = node._override_stack.pop() if node._override_stack else _NO_OVERRIDE
                 node.mark_dependents_dirty()
 
         return OverrideContext()
 
     def mark_dirty(self) -> None:
         """Mark this node and all its dependents as dirty."""
-        if not self.is_dirty:
-            self.is_dirty = True
-            
-        for dep in self.dependents:
-            dep.mark_dirty()
+        self._propagate_dirty([self])
 
     def mark_dependents_dirty(self) -> None:
         """Mark all dependents of this node as dirty."""
-        for dep in self.dependents:
-            dep.mark_dirty()
+        self._propagate_dirty(self.dependents)
+
+    @staticmethod
+    def _propagate_dirty(roots: List['TaskNode']) -> None:
+        """
+        Mark the roots and their descendants dirty with an iterative traversal.
+        
+        Each node is visited at most once, and a descendant that is already dirty
+        is not expanded since its own dependents were marked along with it.
+        """
+        visited = set(roots)
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            node.is_dirty = True
+            for dep in node.dependents:
+                if dep not in visited and not dep.is_dirty:
+                    visited.add(dep)
+                    stack.append(dep)
 
     def reset(self) -> None:
         """Reset the node's computed state and result."""
         if self.is_computed:
-            logger.debug(f"Resetting node '{self.name}'")
+            if _DEBUG:
+                logger.debug("Resetting node '%s'", self.name)
             self.is_computed = False
             self.is_dirty = True
-            self._override_stack = []
+            self._override_value = _NO_OVERRIDE
+            self._override_stack = None
 
     def __repr__(self) -> str:
         """String representation of this node."""
@@ -187,11 +359,31 @@ class DAGRegistry:
     """
     Registry and factory for creating and managing task nodes in a DAG.
     """
-    def __init__(self):
-        """Initialize a new DAG registry."""
+    def __init__(self, debug_delay: float = 0):
+        """
+        Initialize a new DAG registry.
+        
+        Args:
+            debug_delay: Seconds each node sleeps before computing, to make logs easier to follow
+        """
+        self.debug_delay = debug_delay
         self.nodes = {}
-        self.input_nodes = defaultdict(dict)
+        self.input_nodes: Dict[Tuple[str, Any], TaskNode] = {}
         self.cached_values = {}
+        
+        # Topological order cached by DAG._topological_sort; any registration invalidates it
+        self._topo_cache: Optional[List[str]] = None
+        self._layer_cache: Optional[List[List[str]]] = None
+        self._ancestor_cache: Dict[str, Set[str]] = {}  # target -> names it depends on
+        self._graph_dirty: bool = True
+
+    def _register(self, name: str, node: TaskNode) -> None:
+        """Add a node to the registry and invalidate the cached graph structure."""
+        if self.debug_delay:
+            node._debug_delay = self.debug_delay
+        self.nodes[name] = node
+        self._graph_dirty = True
+        self._ancestor_cache.clear()
 
     def node(self, name: Optional[str] = None, dependencies: Optional[List[Union[str, TaskNode]]] = None, 
              mode: ExecutionMode = ExecutionMode.EAGER, can_set: bool = False):
@@ -223,32 +415,44 @@ class DAGRegistry:
                     else:
                         raise ValueError(f"Invalid dependency: {dep}. Must be a task node or registered name.")
             
+            is_cached = mode == ExecutionMode.CACHED
+            
             # Create the task node
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
+                # Regular nodes are created once: later references return it before any other work
+                if not is_cached:
+                    existing = self.nodes.get(node_name)
+                    if existing is not None:
+                        return existing
+                        
                 # For cached nodes, handle date parameter
-                if mode == ExecutionMode.CACHED:
+                if is_cached:
                     # Extract date from args or kwargs if available
                     dt = kwargs.get("dt", args[0] if args else None)
                     
-                    # Create a unique node name with the date
+                    # Create a unique node name with the date, returning the node if already created
                     unique_name = f"{node_name}_{dt}" if dt else node_name
-                    
-                    # Return existing node if already created
-                    if unique_name in self.nodes:
-                        return self.nodes[unique_name]
+                    existing = self.nodes.get(unique_name)
+                    if existing is not None:
+                        return existing
                     
                     # Create a load function for cached values
+                    cache_key = f"{node_name}_{dt}"
                     def load_func():
-                        cache_key = f"{node_name}_{dt}"
                         if cache_key in self.cached_values:
-                            logger.info(f"Loading cached value for '{node_name}' at {dt}")
+                            logger.info("Loading cached value for '%s' at %s", node_name, dt)
                             return self.cached_values[cache_key]
-                        logger.info(f"No cached value for '{node_name}' at {dt}, computing...")
+                        logger.info("No cached value for '%s' at %s, computing...", node_name, dt)
                         result = func(*args, **kwargs)
                         self.cached_values[cache_key] = result
                         return result
                         
+                    # What vectorize() needs to batch the loaders of one family into a single call
+                    load_func.__wrapped__ = func
+                    load_func.call_args = (args, kwargs)
+                    load_func.cache_key = cache_key
+                    
                     # Create and register the node
                     node = TaskNode(
                         name=unique_name,
@@ -259,33 +463,25 @@ class DAGRegistry:
                     )
                     
                     # Register the node
-                    self.nodes[unique_name] = node
+                    self._register(unique_name, node)
                     return node
                 
-                # For regular nodes, handle normal call case
-                if node_name in self.nodes:
-                    return self.nodes[node_name]
-                
                 # Handle extra dependencies from args
                 actual_deps = list(dep_nodes)  # Copy the original dependencies
                 for arg in args:
                     if isinstance(arg, TaskNode) and arg not in actual_deps:
                         actual_deps.append(arg)
                 
-                # Create compute function
-                def compute_func(*dep_values):
-                    return func(*dep_values)
-                
-                # Create and register node
+                # Create and register node; the user function is called directly
                 node = TaskNode(
                     name=node_name,
-                    func=compute_func,
+                    func=func,
                     dependencies=actual_deps,
                     mode=mode,
                     can_set=can_set
                 )
                 
-                self.nodes[node_name] = node
+                self._register(node_name, node)
                 return node
                 
             # Add metadata for easier inspection
@@ -326,8 +522,8 @@ class DAGRegistry:
             node.set_value(value)
             
         # Store in inputs dict
-        self.input_nodes[name][dt] = node
-        self.nodes[node_name] = node
+        self.input_nodes[(name, dt)] = node
+        self._register(node_name, node)
         
         return node
 
@@ -342,7 +538,7 @@ class DAGRegistry:
         Returns:
             The input node if found, None otherwise
         """
-        return self.input_nodes[name].get(dt)
+        return self.input_nodes.get((name, dt))
 
     def fn(self, mode: ExecutionMode = ExecutionMode.EAGER, can_set: bool = False):
         """
@@ -375,7 +571,7 @@ class DAGRegistry:
             if isinstance(dep, TaskNode):
                 # Check that the TaskNode is actually in our registry
                 if dep.name not in self.nodes:
-                    self.nodes[dep.name] = dep
+                    self._register(dep.name, dep)
                 dep_nodes.append(dep)
             elif isinstance(dep, str) and dep in self.nodes:
                 dep_nodes.append(self.nodes[dep])
@@ -385,20 +581,16 @@ class DAGRegistry:
         def decorator(func):
             node_name = func.__name__
             
-            @functools.wraps(func)
-            def compute_func(*dep_values):
-                return func(*dep_values)
-                
-            # Create and register the node right away
+            # Create and register the node right away; the user function is called directly
             node = TaskNode(
                 name=node_name,
-                func=compute_func,
+                func=func,
                 dependencies=dep_nodes,
                 mode=mode,
                 can_set=can_set
             )
             
-            self.nodes[node_name] = node
+            self._register(node_name, node)
             
             # Return a wrapper function that always returns the node
             @functools.wraps(func)
@@ -409,6 +601,224 @@ class DAGRegistry:
             
         return decorator
 
+    def _can_fuse(self, node: TaskNode) -> bool:
+        """Whether node is a plain eager node that may take part in chain fusion."""
+        return node._is_eager and not node.can_set and not node.is_computed
+
+    def optimize(self) -> int:
+        """
+        Fuse chains of eager nodes linked by a single edge into single nodes.
+        
+        A node whose only dependent in turn depends on nothing else is merged into
+        that dependent; the fused node keeps the dependent's name and the producer
+        is removed from the registry. Repeats until no chain is left, so call it
+        after registering all nodes and before executing.
+        
+        Handles to the removed producers and to the replaced consumers are stale
+        afterwards: look nodes up in the registry again, and do not call the
+        producers' decorated functions, which would register them anew.
+        
+        Returns:
+            Number of nodes removed by fusion
+        """
+        fused_count = 0
+        changed = True
+        while changed:
+            changed = False
+            for node in list(self.nodes.values()):
+                # Skip nodes an earlier fusion in this pass removed or replaced
+                if self.nodes.get(node.name) is not node:
+                    continue
+                if len(node.dependents) != 1 or not self._can_fuse(node):
+                    continue
+                consumer = next(iter(node.dependents))
+                if len(consumer.dependencies) != 1 or not self._can_fuse(consumer):
+                    continue
+                self._fuse(node, consumer)
+                fused_count += 1
+                changed = True
+        return fused_count
+
+    def _fuse(self, producer: TaskNode, consumer: TaskNode) -> TaskNode:
+        """Replace producer -> consumer with one node computing consumer.func(producer.func(...))."""
+        def fused_func(*dep_values, f=producer.func, g=consumer.func):
+            value = f(*dep_values)
+            # Match the unfused graph, where a None input leaves the consumer uncomputed and dirty
+            if value is None:
+                raise _SkipCompute
+            return g(value)
+            
+        # Detach the producer from its dependencies before the fused node registers itself
+        for dep in producer.dependencies:
+            dep.dependents.remove(producer)
+            
+        fused = TaskNode(
+            name=consumer.name,
+            func=fused_func,
+            dependencies=producer.dependencies,
+            mode=consumer.mode,
+            can_set=False
+        )
+        
+        # Point the consumer's dependents at the fused node (a copy, so the stale consumer
+        # does not share the fused node's back-edges)
+        fused.dependents = weakref.WeakSet(consumer.dependents)
+        for dependent in fused.dependents:
+            dependent.dependencies = [fused if dep is consumer else dep for dep in dependent.dependencies]
+            dependent._dep_getters = tuple(dep.get_value for dep in dependent.dependencies)
+            
+        del self.nodes[producer.name]
+        self._register(consumer.name, fused)
+        return fused
+
+    def vectorize(self, node_name_prefix: str) -> int:
+        """
+        Compute a family of date-parameterized nodes with one NumPy-broadcast call.
+        
+        All nodes named "<prefix>_<dt>" must share the same user function. The inputs
+        of each node (its dependency values, or the call arguments of a CACHED loader)
+        are stacked position by position (dicts of scalars become dicts of arrays) and
+        the function is called once; element i of the output becomes the result of
+        node i. CACHED nodes already in the cache take the cached value and new results
+        are cached. Nodes with a None dependency are left for regular compute.
+        
+        Args:
+            node_name_prefix: Name prefix shared by the node family
+            
+        Returns:
+            Number of nodes whose result was filled
+            
+        Raises:
+            ValueError: If the matching nodes do not share one function and arity
+        """
+        import numpy as np  # Optional dependency, only needed when vectorizing
+        
+        prefix = f"{node_name_prefix}_"
+        group = [node for name, node in self.nodes.items() if name.startswith(prefix)]
+        if not group:
+            return 0
+            
+        # Compare the user functions, not the per-node loader closures of CACHED nodes
+        func = getattr(group[0].func, "__wrapped__", group[0].func)
+        signature = self._vector_signature(group[0])
+        if any(getattr(node.func, "__wrapped__", node.func) is not func
+               or self._vector_signature(node) != signature for node in group):
+            raise ValueError(f"Nodes matching '{prefix}*' do not share one function and arity")
+        arity, keywords = signature
+            
+        # Gather input values row by row, skipping nodes that cannot compute yet
+        rows = []
+        ready = []
+        filled = []
+        for node in group:
+            call_args = getattr(node.func, "call_args", None)
+            if call_args is None:
+                values = [get_value() for get_value in node._dep_getters]
+                if any(value is None for value in values):
+                    continue
+            elif node.func.cache_key in self.cached_values:
+                filled.append((node, self.cached_values[node.func.cache_key]))
+                continue
+            else:
+                args, kwargs = call_args
+                values = list(args) + [kwargs[key] for key in keywords]
+            rows.append(values)
+            ready.append(node)
+            
+        if ready:
+            # Stack each argument position into an array (or a dict of arrays)
+            columns = []
+            for column in zip(*rows):
+                if isinstance(column[0], dict):
+                    columns.append({key: np.array([value[key] for value in column]) for key in column[0]})
+                else:
+                    columns.append(np.array(column))
+                    
+            output = func(*columns[:arity], **dict(zip(keywords, columns[arity:])))
+            shape = (len(ready),)
+            if isinstance(output, dict):
+                # A dict of arrays scatters back into one dict per node
+                per_key = {key: np.broadcast_to(np.asarray(value), shape).tolist() for key, value in output.items()}
+                results = [{key: values[i] for key, values in per_key.items()} for i in range(len(ready))]
+            else:
+                results = np.broadcast_to(np.asarray(output), shape).tolist()
+            for node, result in zip(ready, results):
+                cache_key = getattr(node.func, "cache_key", None)
+                if cache_key is not None:
+                    self.cached_values[cache_key] = result
+                filled.append((node, result))
+                
+        for node, result in filled:
+            node.result = result
+            node.is_computed = True
+            node.is_dirty = False
+            node.mark_dependents_dirty()
+        return len(filled)
+
+    @staticmethod
+    def _vector_signature(node: TaskNode) -> Tuple[int, Tuple[str, ...]]:
+        """Positional arity and keyword names of the inputs vectorize() stacks for a node."""
+        call_args = getattr(node.func, "call_args", None)
+        if call_args is None:
+            return len(node.dependencies), ()
+        args, kwargs = call_args
+        return len(args), tuple(sorted(kwargs))
+
+    def compile(self, signatures: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        Replace the functions of computed nodes with numba.njit-compiled versions.
+        
+        Input and CACHED nodes keep their Python loaders. Nodes with an entry in
+        `signatures` are compiled right away; the rest compile on their first call.
+        A node numba cannot type keeps its Python function and a warning is logged.
+        
+        Args:
+            signatures: Optional map from node name to a numba signature string
+            
+        Returns:
+            Names of the nodes whose functions were replaced
+        """
+        import numba  # Optional dependency, only needed when compiling
+        from numba.core.errors import TypingError
+        
+        signatures = signatures or {}
+        inputs = set(self.input_nodes.values())
+        compiled = []
+        for node_name, node in self.nodes.items():
+            # Only user functions of computed nodes are candidates (numba dispatchers have py_func)
+            func = node.func
+            if node in inputs or node.mode == ExecutionMode.CACHED or hasattr(func, "py_func"):
+                continue
+                
+            signature = signatures.get(node_name)
+            try:
+                jitted = numba.njit(signature, cache=True)(func)
+            except Exception as e:
+                logger.warning("Node '%s': numba compilation failed, keeping Python function (%s)", node_name, e)
+                continue
+                
+            if signature is None:
+                jitted = self._jit_with_fallback(node, jitted, func, TypingError)
+            node.func = jitted
+            compiled.append(node_name)
+            
+        return compiled
+
+    @staticmethod
+    def _jit_with_fallback(node: TaskNode, jitted: Callable, func: Callable, typing_error: type) -> Callable:
+        """Call a lazily compiled function once, then settle on it or on the Python original."""
+        def first_call(*dep_values):
+            try:
+                result = jitted(*dep_values)
+            except typing_error as e:
+                logger.warning("Node '%s': numba could not type the function, keeping Python function (%s)", node.name, e)
+                node.func = func
+                return func(*dep_values)
+            node.func = jitted
+            return result
+            
+        return first_call
+
     def reset(self):
         """Reset all nodes in the registry."""
         for node in self.nodes.values():
@@ -422,101 +832,241 @@ class DAG:
     
     Supports mixed eager and lazy evaluation strategies using the TaskNode objects.
     """
-    def __init__(self, registry: DAGRegistry):
+    def __init__(self, registry: DAGRegistry, max_workers: Optional[int] = None):
         """
         Initialize the DAG with a registry of nodes.
         
         Args:
             registry: The registry containing task nodes
+            max_workers: Thread pool size for running independent eager nodes
         """
         self.registry = registry
         self.eager_executed = False
+        self.max_workers = max_workers
+        self._executor = None  # Created on the first layer with parallel work; released by close()
+        self._eager_targets: Set[str] = set()  # Targets whose eager ancestors have been run
 
-    def _build_graph(self) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+    def _build_graph(self) -> Tuple[List[str], array, array, array]:
         """
-        Build adjacency list and in-degree map for topological sorting.
+        Build a CSR (compressed sparse row) adjacency and in-degree array for sorting.
+        
+        Nodes are numbered in registration order; the dependents of node i are
+        indices[indptr[i]:indptr[i + 1]], packed into flat int arrays.
         
         Returns:
-            Tuple of (adjacency_list, in_degree_map)
+            Tuple of (index_to_name, indptr, indices, in_degree)
         """
         nodes = self.registry.nodes
+        idx_to_name = list(nodes)
+        name_to_idx = {name: i for i, name in enumerate(idx_to_name)}
         
-        # adjacency_list[node] = list of nodes that depend on it
-        adjacency_list = {name: [] for name in nodes}
+        # in_degree[i] = number of nodes node i depends on
+        in_degree = array('i', [len(node.dependencies) for node in nodes.values()])
         
-        # in_degree[node] = number of nodes it depends on
-        in_degree = {name: 0 for name in nodes}
+        # Edge sources (dependency -> dependent) in registration order of the dependent
+        sources = [name_to_idx[dep.name] for node in nodes.values() for dep in node.dependencies]
+        targets = [i for i, node in enumerate(nodes.values()) for _ in node.dependencies]
         
-        for node_name, node in nodes.items():
-            in_degree[node_name] = len(node.dependencies)
-            for dep in node.dependencies:
-                adjacency_list[dep.name].append(node_name)
-                
-        return adjacency_list, in_degree
+        # Row pointers from the out-degree prefix sum, then scatter each edge into its row
+        indptr = array('i', bytes(4 * (len(idx_to_name) + 1)))
+        for src in sources:
+            indptr[src + 1] += 1
+        for i in range(len(idx_to_name)):
+            indptr[i + 1] += indptr[i]
+        indices = array('i', bytes(4 * len(sources)))
+        cursor = indptr[:-1]
+        for src, dst in zip(sources, targets):
+            indices[cursor[src]] = dst
+            cursor[src] += 1
+            
+        return idx_to_name, indptr, indices, in_degree
 
     def _topological_sort(self) -> List[str]:
         """
         Perform topological sort of the node graph using Kahn's algorithm.
         
+        The order is cached on the registry and reused until a node is registered.
+        
         Returns:
             List of node names in topological order
             
         Raises:
             ValueError: If a cycle is detected in the graph
         """
-        adjacency_list, in_degree = self._build_graph()
+        registry = self.registry
+        if not registry._graph_dirty and registry._topo_cache is not None:
+            return registry._topo_cache
+            
+        idx_to_name, indptr, indices, in_degree = self._build_graph()
         
         # Start with nodes that have no dependencies
-        queue = [name for name, degree in in_degree.items() if degree == 0]
-        sorted_nodes = []
+        queue = deque(i for i, degree in enumerate(in_degree) if degree == 0)
+        order = []
         
         while queue:
-            current_node = queue.pop(0)
-            sorted_nodes.append(current_node)
-            
-            # Update in-degrees of dependent nodes
-            for dependent_node in adjacency_list[current_node]:
-                in_degree[dependent_node] -= 1
-                if in_degree[dependent_node] == 0:
-                    queue.append(dependent_node)
+            current = queue.popleft()
+            order.append(current)
+            
+            # Update in-degrees of dependent nodes, a contiguous slice of the CSR row
+            for dependent in indices[indptr[current]:indptr[current + 1]]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
                     
+        sorted_nodes = [idx_to_name[i] for i in order]
+        
         # Check for cycles
-        if len(sorted_nodes) != len(self.registry.nodes):
-            missing_nodes = set(self.registry.nodes.keys()) - set(sorted_nodes)
+        if len(sorted_nodes) != len(registry.nodes):
+            missing_nodes = set(registry.nodes.keys()) - set(sorted_nodes)
             raise ValueError(f"Cycle detected in graph. Nodes in cycle: {missing_nodes}")
             
+        # Group nodes into layers by longest path from a source so each layer is independent
+        nodes = registry.nodes
+        level = {}
+        layers = []
+        for node_name in sorted_nodes:
+            node = nodes[node_name]
+            node_level = 1 + max((level[dep.name] for dep in node.dependencies), default=-1)
+            level[node_name] = node_level
+            if node_level == len(layers):
+                layers.append([])
+            layers[node_level].append(node_name)
+            
+        registry._topo_cache = sorted_nodes
+        registry._layer_cache = layers
+        registry._graph_dirty = False
         return sorted_nodes
 
-    def run_eager_nodes(self) -> None:
+    def _layers(self) -> List[List[str]]:
+        """
+        Group node names into layers whose members do not depend on each other.
+        
+        Returns:
+            Layers in execution order, each in topological order
+        """
+        self._topological_sort()
+        return self.registry._layer_cache
+
+    def _ancestors(self, target: str) -> Set[str]:
+        """
+        Names of the target and every node it transitively depends on.
+        
+        Computed with an iterative DFS and cached on the registry until a node is registered.
+        
+        Args:
+            target: Name of the node to collect ancestors for
+            
+        Returns:
+            Set of node names, including the target itself
+        """
+        cache = self.registry._ancestor_cache
+        ancestors = cache.get(target)
+        if ancestors is not None:
+            return ancestors
+            
+        ancestors = {target}
+        stack = [self.registry.nodes[target]]
+        while stack:
+            for dep in stack.pop().dependencies:
+                if dep.name not in ancestors:
+                    ancestors.add(dep.name)
+                    stack.append(dep)
+                    
+        cache[target] = ancestors
+        return ancestors
+
+    def _pending_eager(self, layer: List[str], needed: Optional[Set[str]] = None) -> List[TaskNode]:
+        """Eager nodes of a layer that still need computing, optionally limited to `needed`."""
+        pending = []
+        for node_name in layer:
+            if needed is not None and node_name not in needed:
+                continue
+            node = self.registry.nodes[node_name]
+            if node._is_eager and not node.is_computed:
+                logger.info("Processing eager node '%s'", node_name)
+                pending.append(node)
+        return pending
+
+    def _eager_phase_done(self, target: Optional[str]) -> bool:
+        """Whether the eager phase already ran for the whole graph or for this target."""
+        return self.eager_executed or (target is not None and target in self._eager_targets)
+
+    def _finish_eager_phase(self, target: Optional[str]) -> None:
+        """Record that the eager phase ran for the whole graph (target None) or one target."""
+        if target is None:
+            self.eager_executed = True
+        else:
+            self._eager_targets.add(target)
+
+    def run_eager_nodes(self, target: Optional[str] = None) -> None:
         """
         Execute all eager nodes in topological order.
         
         Tasks marked as LAZY will only compute when their value is requested.
-        Tasks marked as EAGER will compute during this phase.
+        Tasks marked as EAGER will compute during this phase. Eager nodes in the
+        same layer are independent and run concurrently on a thread pool.
+        
+        Args:
+            target: If given, only eager nodes the target depends on are computed
         """
-        if self.eager_executed:
+        if self._eager_phase_done(target):
             logger.debug("Eager nodes already executed, skipping.")
             return
             
         logger.info("Starting eager execution phase")
         
         try:
-            topo_order = self._topological_sort()
-            logger.info(f"Topological order: {topo_order}")
-            
-            # Process eager nodes in topological order
-            for node_name in topo_order:
-                node = self.registry.nodes[node_name]
-                if node.mode == ExecutionMode.EAGER and not node.is_computed:
-                    logger.info(f"Processing eager node '{node_name}'")
-                    node.compute()
+            layers = self._layers()
+            logger.info("Topological order: %s", self.registry._topo_cache)
+            needed = self._ancestors(target) if target is not None else None
+            
+            # Process eager nodes layer by layer, waiting for each layer before the next
+            for layer in layers:
+                pending = self._pending_eager(layer, needed)
+                if len(pending) == 1:
+                    pending[0].compute()
+                elif pending:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+                    # Wait for the whole layer; result() re-raises the first failure
+                    futures = [self._executor.submit(node.compute) for node in pending]
+                    for future in futures:
+                        future.result()
                     
         except ValueError as e:
-            logger.error(f"Error during eager execution: {e}")
+            logger.error("Error during eager execution: %s", e)
+            return
+            
+        logger.info("Completed eager execution phase")
+        self._finish_eager_phase(target)
+
+    async def run_eager_nodes_async(self, target: Optional[str] = None) -> None:
+        """
+        Execute all eager nodes layer by layer from a running event loop.
+        
+        Each node of a layer computes in a worker thread via asyncio.to_thread.
+        
+        Args:
+            target: If given, only eager nodes the target depends on are computed
+        """
+        if self._eager_phase_done(target):
+            logger.debug("Eager nodes already executed, skipping.")
+            return
+            
+        logger.info("Starting eager execution phase")
+        
+        try:
+            needed = self._ancestors(target) if target is not None else None
+            for layer in self._layers():
+                pending = self._pending_eager(layer, needed)
+                await asyncio.gather(*[asyncio.to_thread(node.compute) for node in pending])
+                
+        except ValueError as e:
+            logger.error("Error during eager execution: %s", e)
             return
             
         logger.info("Completed eager execution phase")
-        self.eager_executed = True
+        self._finish_eager_phase(target)
 
     def get_node_value(self, node_name: str) -> Any:
         """
@@ -549,13 +1099,13 @@ class DAG:
         if target_node not in self.registry.nodes:
             raise ValueError(f"Target node '{target_node}' not found in DAG")
             
-        logger.info(f"Executing DAG with target: {target_node}")
+        logger.info("Executing DAG with target: %s", target_node)
         
-        # First run eager nodes
-        self.run_eager_nodes()
+        # First run the eager nodes the target depends on
+        self.run_eager_nodes(target_node)
         
         # Then get the value of the target node (will compute lazy dependencies as needed)
-        logger.info(f"Computing target node: {target_node}")
+        logger.info("Computing target node: %s", target_node)
         result = self.get_node_value(target_node)
         
         self._print_state()
@@ -566,15 +1116,32 @@ class DAG:
         """Reset the state of all nodes."""
         self.registry.reset()
         self.eager_executed = False
+        self._eager_targets.clear()
+
+    def close(self) -> None:
+        """Shut down the worker threads used for parallel eager execution."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'DAG':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
             
     def _print_state(self) -> None:
         """Print the current state of all nodes."""
+        # Skip the walk (and the value lookups) entirely when INFO is filtered out
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info("Current state of all nodes:")
         for name, node in sorted(self.registry.nodes.items()):
             status = "Computed" if node.is_computed else "Not Computed"
-            value = node.get_value() if node.is_computed else "N/A"
+            # Report the stored result; get_value() could trigger lazy computation
+            value = node.result if node.is_computed else "N/A"
             mode = node.mode.value
-            logger.info(f"Node: {name:<20} ({mode:<5}), Status: {status:<12}, Value: {value}")
+            logger.info("Node: %-20s (%-5s), Status: %-12s, Value: %s", name, mode, status, value)
 
 
 # Create global registry and DAG instances
@@ -588,6 +1155,9 @@ graph = DAG(dag)
 if __name__ == "__main__":
     import datetime
 
+    # Log every node computation so the demo shows the evaluation order
+    set_debug(True)
+
     # Reset for clean demo
     dag.reset()
     graph.reset()
@@ -742,4 +1312,6 @@ if __name__ == "__main__":
     # Rerun - should use cached values
     print("\nRerunning (should use cached values):")
     result = graph.execute("market_value")
-    print(f"Market value (recomputed): {result}")
\ No newline at end of file
+    print(f"Market value (recomputed): {result}")
+
+    graph.close()
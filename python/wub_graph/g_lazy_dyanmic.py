@@ -1,4 +1,3 @@
-from collections import defaultdict
 from datetime import date
 from enum import Enum
 
@@ -7,6 +6,8 @@ class Mode(Enum):
     COMPUTED = "computed"
 
 class ReactiveNode:
+    __slots__ = ('compute_fn', 'dependencies', 'dependents', '_value', '_is_dirty', '_override_stack', 'can_set')
+
     def __init__(self, value=None, compute_fn=None, dependencies=None, can_set=False):
         self.compute_fn = compute_fn
         self.dependencies = dependencies or []
@@ -40,14 +41,23 @@ class ReactiveNode:
         self._is_dirty = False
 
     def mark_dirty(self):
-        if not self._is_dirty:
-            self._is_dirty = True
-        for dep in self.dependents:
-            dep.mark_dirty()
+        self._propagate_dirty([self])
 
     def mark_dependents_dirty(self):
-        for dep in self.dependents:
-            dep.mark_dirty()
+        self._propagate_dirty(self.dependents)
+
+    @staticmethod
+    def _propagate_dirty(roots):
+        # Iterative walk visiting each node once; already-dirty descendants are not expanded
+        visited = set(roots)
+        stack = list(roots)
+        while stack:
+            node = stack.pop()
+            node._is_dirty = True
+            for dep in node.dependents:
+                if dep not in visited and not dep._is_dirty:
+                    visited.add(dep)
+                    stack.append(dep)
 
     def override(self, temp_value):
         node = self
@@ -70,15 +80,15 @@ class ReactiveNode:
 
 class WubGraph:
     def __init__(self):
-        self.inputs = defaultdict(dict)
+        self.inputs = {}  # (name, dt) -> input node
 
     def input(self, name, dt, value=None):
         node = ReactiveNode(value=value, can_set=True)
-        self.inputs[name][dt] = node
+        self.inputs[(name, dt)] = node
         return node
 
     def get_input(self, name, dt):
-        return self.inputs[name].get(dt)
+        return self.inputs.get((name, dt))
 
     def fn(self, mode, can_set=False):
         def decorator(func):
@@ -1,4 +1,5 @@
-from collections import defaultdict
+import contextlib
+from collections import defaultdict, deque
 from datetime import date
 from enum import Enum
 
@@ -6,24 +7,56 @@ class Mode(Enum):
     CACHED = "cached"
     COMPUTED = "computed"
 
+@contextlib.contextmanager
+def _override(node, temp_value):
+    # Defined once at module level rather than as a class built on every override() call
+    original_value, original_overridden = node._value, node._overridden
+    # While overridden, compute() hands back the temporary value even if upstream changes
+    node._value, node._overridden = temp_value, True
+    node._mark_dependents_dirty()
+    try:
+        yield node
+    finally:
+        node._value, node._overridden = original_value, original_overridden
+        if node.compute_fn:
+            # Upstream may have changed during the override, so the restored value may be stale
+            node._dirty = True
+        node._mark_dependents_dirty()
+
 class ReactiveNodePyTorch:
     def __init__(self, value=None, compute_fn=None, dependencies=None, can_set=False):
         self.compute_fn = compute_fn
         self.dependencies = dependencies or []
+        self.dependents = []  # Filled in by WubGraphPyTorch.fn
         self._value = value
         self.can_set = can_set
+        self._dirty = True  # Computed nodes start without a value
+        self._overridden = False  # Set by override() while a temporary value is in place
 
     def set_value(self, value):
         if not self.can_set:
             raise ValueError("Cannot set value on immutable node")
         self._value = value
-        # In a simpler PyTorch style, we might not explicitly track dependents for manual recomputation
+        self._mark_dependents_dirty()
+
+    def _mark_dependents_dirty(self):
+        # Push-based invalidation; an already-dirty node's dependents are dirty too, so stop there
+        queue = deque(self.dependents)
+        while queue:
+            node = queue.popleft()
+            if not node._dirty:
+                node._dirty = True
+                queue.extend(node.dependents)
 
     def compute(self):
+        # Only recompute when an upstream value changed since the last computation
+        if not self._dirty or self._overridden:
+            return self._value
         if self.compute_fn:
             args = [dep.get_value() for dep in self.dependencies]
             if all(arg is not None for arg in args):
                 self._value = self.compute_fn(*args)
+                self._dirty = False
         return self._value
 
     def get_value(self):
@@ -33,20 +66,7 @@ class ReactiveNodePyTorch:
 
     def override(self, temp_value):
         # Simplified override for demonstration
-        class OverrideContext:
-            def __init__(self_inner, node):
-                self_inner.node = node
-                self_inner.original_value = None
-
-            def __enter__(self_inner):
-                self_inner.original_value = self_inner.node._value
-                self_inner.node._value = temp_value
-                return self_inner.node
-
-            def __exit__(self_inner, exc_type, exc_val, exc_tb):
-                self_inner.node._value = self_inner.original_value
-
-        return OverrideContext(self)
+        return _override(self, temp_value)
 
     def __repr__(self):
         return f"ReactiveNodePyTorch(value={self._value}, can_set={self.can_set})"
@@ -63,7 +83,10 @@ class WubGraphPyTorch:
     def fn(self, func):
         def wrapper(*args):
             dep_nodes = [arg for arg in args if isinstance(arg, ReactiveNodePyTorch)]
-            return ReactiveNodePyTorch(compute_fn=lambda *a: func(*a), dependencies=dep_nodes)
+            node = ReactiveNodePyTorch(compute_fn=lambda *a: func(*a), dependencies=dep_nodes)
+            for dep in dep_nodes:
+                dep.dependents.append(node)
+            return node
         return wrapper
 
 # --- PyTorch-style Example (Adjusted) ---
@@ -1,7 +1,6 @@
-from collections import defaultdict
 from datetime import date
 from enum import Enum
-from collections import deque
+from array import array
 
 class Mode(Enum):
     CACHED = "cached"
@@ -21,11 +20,14 @@ class WubGraphRawTFStyle:
     def __init__(self):
         self.symbolic_inputs = {}
         self.symbolic_nodes = {}
+        self._sorted = None  # Cached topological order, reset whenever a node is added
+        self._fused = None  # Generated whole-graph function from compile(), if any
 
     def input(self, name):
         symbolic_input = SymbolicNodeRaw(name=name)
         self.symbolic_inputs[name] = symbolic_input
         self.symbolic_nodes[name] = symbolic_input
+        self._invalidate()
         return symbolic_input
 
     def fn(self, func):
@@ -33,57 +35,141 @@ class WubGraphRawTFStyle:
             input_nodes = [self.symbolic_nodes[name] for name in arg_names]
             symbolic_output = SymbolicNodeRaw(name=func.__name__, operation=func, inputs=input_nodes)
             self.symbolic_nodes[func.__name__] = symbolic_output
+            self._invalidate()
             return symbolic_output
         return wrapper
 
-    def _build_dependency_graph(self):
-        dependency_graph = defaultdict(list)
-        in_degree = defaultdict(int)
-        for node in self.symbolic_nodes.values():
+    def _invalidate(self):
+        # The graph changed: drop the cached order, plan and fused function
+        self._sorted = None
+        self._fused = None
+
+    def _number_nodes(self):
+        # Number nodes by registration order; every edge must point at a registered node
+        nodes = list(self.symbolic_nodes.values())
+        for idx, node in enumerate(nodes):
+            node._idx = idx
+        for name, input_node in self.symbolic_inputs.items():
+            if self.symbolic_nodes.get(name) is not input_node:
+                raise ValueError(f"Input '{name}' was replaced by a later registration")
+        for node in nodes:
             for input_node in node.inputs:
-                dependency_graph[input_node].append(node)
-                in_degree[node] += 1
-        return dependency_graph, in_degree
+                if self.symbolic_nodes.get(input_node.name) is not input_node:
+                    raise ValueError(
+                        f"Node '{node.name}' depends on a '{input_node.name}' that was replaced by a later registration"
+                    )
+        return nodes
+
+    def _build_dependency_graph(self, nodes):
+        # Child lists and in-degrees over the numbering from _number_nodes, in one O(E) pass
+        children = [[] for _ in nodes]
+        in_degree = array('i', [0]) * len(nodes)
+        for node in nodes:
+            for input_node in node.inputs:
+                children[input_node._idx].append(node._idx)
+                in_degree[node._idx] += 1
+        return children, in_degree
 
     def topological_sort(self):
-        dependency_graph, in_degree = self._build_dependency_graph()
-        dq = deque([node for node in self.symbolic_inputs.values() if in_degree[node] == 0])
-        sorted_list = []
-
-        while dq:
-            node = dq.popleft()
-            sorted_list.append(node)
-            for neighbor in dependency_graph[node]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    dq.append(neighbor)
+        return self._sort(self._number_nodes())
+
+    def _sort(self, nodes):
+        # Expects the numbering _number_nodes() just assigned to nodes
+        children, in_degree = self._build_dependency_graph(nodes)
+        # Kahn's algorithm with the worklist kept in place in a preallocated order array:
+        # order[head:tail] holds nodes whose inputs are all done but that are not expanded yet
+        order = array('i', [0]) * len(nodes)
+        tail = 0
+        for node in self.symbolic_inputs.values():
+            if in_degree[node._idx] == 0:
+                order[tail] = node._idx
+                tail += 1
+
+        head = 0
+        while head < tail:
+            for child in children[order[head]]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    order[tail] = child
+                    tail += 1
+            head += 1
+        sorted_list = [nodes[idx] for idx in order[:tail]]
 
         if len(sorted_list) != len(self.symbolic_nodes):
             raise ValueError("Cycle detected in the computation graph")
 
         return sorted_list
 
+    def _build_plan(self):
+        # Flatten execution into index-based steps over the node numbering of the sort
+        self._nodes = self._number_nodes()
+        self._sorted = self._sort(self._nodes)
+        self._names = [node.name for node in self._nodes]
+        self._plan = [(node.operation, tuple(inp._idx for inp in node.inputs), node._idx)
+                      for node in self._sorted if node.operation]
+        self._input_idx = {name: sym._idx for name, sym in self.symbolic_inputs.items()}
+        # Inputs some op reads; these must be fed, the others just come back as None
+        used = {i for _, ins, _ in self._plan for i in ins}
+        self._required_inputs = [name for name, idx in self._input_idx.items() if idx in used]
+
+    def compile(self, jit=False):
+        """
+        Fuse the whole graph into one generated function that calls every op in order.
+
+        With jit=True the ops and the fused function are compiled with numba.njit;
+        every input must then be fed and every op must be numba-compatible.
+        """
+        if self._sorted is None:
+            self._build_plan()
+        if jit:
+            import numba  # Optional dependency, only needed for jit=True
+
+        # One local per node index: inputs arrive as parameters, each op assigns its slot
+        namespace = {}
+        params = ", ".join(f"t{idx}" for idx in self._input_idx.values())
+        lines = [f"def _fused({params}):"]
+        for op, ins, out in self._plan:
+            namespace[f"op{out}"] = numba.njit(op) if jit else op
+            lines.append(f"    t{out} = op{out}({', '.join(f't{i}' for i in ins)})")
+        lines.append("    return (" + "".join(f"t{i}, " for i in range(len(self._nodes))) + ")")
+        exec(compile("\n".join(lines), "<WubGraphRawTFStyle.compile>", "exec"), namespace)
+
+        fused = namespace["_fused"]
+        self._fused = numba.njit(fused) if jit else fused
+        return self._fused
+
     def execute(self, feed_dict):
-        node_outputs = {}
-        sorted_nodes = self.topological_sort()
+        if self._sorted is None:
+            self._build_plan()
+
+        # Fail before running any op rather than handing None to one
+        for name in self._required_inputs:
+            if name not in feed_dict:
+                raise ValueError(f"Missing input value for '{name}'")
+
+        if self._fused is not None:
+            for name in feed_dict:
+                if name not in self._input_idx:
+                    raise ValueError(f"Missing input value for '{name}'")
+            outputs = self._fused(*[feed_dict.get(name) for name in self._input_idx])
+            return dict(zip(self._names, outputs))
+
+        outputs = [None] * len(self._nodes)
 
         # Initialize outputs of input nodes
+        input_idx = self._input_idx
         for name, value in feed_dict.items():
-            if name in self.symbolic_inputs:
-                node_outputs[self.symbolic_inputs[name]] = value
+            if name in input_idx:
+                outputs[input_idx[name]] = value
             else:
                 raise ValueError(f"Missing input value for '{name}'")
 
         # Execute operations in topological order
-        for node in sorted_nodes:
-            if node.operation:
-                input_values = [node_outputs[input_node] for input_node in node.inputs]
-                result = node.operation(*input_values)
-                node_outputs[node] = result
+        for op, ins, out in self._plan:
+            outputs[out] = op(*[outputs[i] for i in ins])
 
         # Collect results by node name
-        results = {node.name: node_outputs.get(node) for node in self.symbolic_nodes.values()}
-        return results
+        return dict(zip(self._names, outputs))
 
 # --- Raw Python TensorFlow-style Example (Using Topological Sort) ---
 
@@ -0,0 +1,186 @@
+import logging
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from g_hybrid import DAG, DAGRegistry, ExecutionMode, TaskNode
+
+logging.disable(logging.INFO)
+
+
+class OptimizeTest(unittest.TestCase):
+    def build_chain(self, length):
+        registry = DAGRegistry()
+
+        @registry.node()
+        def n0():
+            return 1
+
+        node = n0()
+        for i in range(1, length):
+            def step(x):
+                return x * 10 + 1
+            step.__name__ = f"n{i}"
+            node = registry.depends_on(node)(step)()
+        return registry, node.name
+
+    def test_chain_of_three_fuses_into_one_node(self):
+        registry, last = self.build_chain(3)
+        self.assertEqual(registry.optimize(), 2)
+        self.assertEqual(list(registry.nodes), [last])
+        self.assertEqual(registry.nodes[last].dependencies, [])
+        with DAG(registry) as graph:
+            self.assertEqual(graph.execute(last), 111)
+
+    def test_long_chain_keeps_result(self):
+        registry, last = self.build_chain(6)
+        unfused, _ = self.build_chain(6)
+        with DAG(unfused) as graph:
+            expected = graph.execute(last)
+        registry.optimize()
+        with DAG(registry) as graph:
+            self.assertEqual(graph.execute(last), expected)
+
+    def test_fused_node_has_its_own_dependents(self):
+        registry = DAGRegistry()
+
+        @registry.node()
+        def a():
+            return 2
+
+        @registry.depends_on(a())
+        def b(x):
+            return x + 1
+
+        @registry.depends_on("b")
+        def c(x):
+            return x * 3
+
+        @registry.depends_on("c", mode=ExecutionMode.LAZY)
+        def d(x):
+            return x - 1
+
+        old_c = registry.nodes["c"]
+        registry.optimize()
+        self.assertIsNot(registry.nodes["c"].dependents, old_c.dependents)
+        with DAG(registry) as graph:
+            self.assertEqual(graph.execute("d"), 8)
+
+    def test_fused_node_stays_dirty_when_producer_returns_none(self):
+        registry = DAGRegistry()
+        source = registry.input("source", 1, 5)
+
+        @registry.depends_on(source)
+        def maybe(x):
+            return None
+
+        @registry.depends_on("maybe")
+        def plus_one(x):
+            return x + 1
+
+        self.assertEqual(registry.optimize(), 1)
+        with DAG(registry) as graph:
+            self.assertIsNone(graph.execute("plus_one"))
+        fused = registry.nodes["plus_one"]
+        self.assertFalse(fused.is_computed)
+        self.assertTrue(fused.is_dirty)
+
+
+class SpecializedClassTest(unittest.TestCase):
+    def test_subclasses_are_named_per_arity(self):
+        source = TaskNode("a", lambda: 1)
+        pair = TaskNode("b", lambda x, y: x + y, [source, source])
+        self.assertEqual(type(source).__name__, "TaskNode0")
+        self.assertEqual(type(pair).__qualname__, "TaskNode2")
+        self.assertEqual(type(pair).__module__, TaskNode.__module__)
+
+
+class ExecutorTest(unittest.TestCase):
+    def test_close_releases_worker_threads(self):
+        registry = DAGRegistry()
+        sources = []
+        for i in range(4):
+            def source():
+                return 1
+            source.__name__ = f"s{i}"
+            sources.append(registry.node()(source)())
+
+        @registry.depends_on(*sources)
+        def total(*values):
+            return sum(values)
+
+        threads_before = threading.active_count()
+        with DAG(registry, max_workers=4) as graph:
+            self.assertEqual(graph.execute("total"), 4)
+            self.assertIsNotNone(graph._executor)
+        self.assertIsNone(graph._executor)
+        self.assertEqual(threading.active_count(), threads_before)
+
+    def test_close_without_parallel_work(self):
+        graph = DAG(DAGRegistry())
+        graph.close()
+        graph.close()
+        self.assertIsNone(graph._executor)
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class VectorizeTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = registry = DAGRegistry()
+        self.calls = []
+
+        @registry.node(mode=ExecutionMode.CACHED)
+        def market_data(dt):
+            self.calls.append(dt)
+            return {"price": 100.0 + dt, "volume": 10 * dt}
+
+        def market_value(data):
+            return data["price"] * data["volume"]
+
+        # One user function shared by the whole date family
+        self.dts = [1, 2, 3]
+        for dt in self.dts:
+            registry.node(name=f"market_value_{dt}", dependencies=[market_data(dt)],
+                          mode=ExecutionMode.LAZY)(market_value)()
+
+    def test_cached_family_loads_in_one_call(self):
+        self.assertEqual(self.registry.vectorize("market_data"), 3)
+        self.assertEqual(len(self.calls), 1)
+        for dt in self.dts:
+            expected = {"price": 100.0 + dt, "volume": 10 * dt}
+            self.assertEqual(self.registry.nodes[f"market_data_{dt}"].get_value(), expected)
+            self.assertEqual(self.registry.cached_values[f"market_data_{dt}"], expected)
+
+    def test_cached_family_reuses_cached_values(self):
+        self.registry.cached_values["market_data_2"] = {"price": 1.0, "volume": 1}
+        self.assertEqual(self.registry.vectorize("market_data"), 3)
+        self.assertEqual(self.registry.nodes["market_data_2"].get_value(), {"price": 1.0, "volume": 1})
+
+    def test_computed_family_matches_regular_compute(self):
+        self.registry.vectorize("market_data")
+        self.assertEqual(self.registry.vectorize("market_value"), 3)
+        for dt in self.dts:
+            node = self.registry.nodes[f"market_value_{dt}"]
+            self.assertFalse(node.is_dirty)
+            self.assertEqual(node.result, (100.0 + dt) * 10 * dt)
+
+    def test_mixed_functions_are_rejected(self):
+        @self.registry.node(name="market_value_extra", mode=ExecutionMode.LAZY)
+        def other():
+            return 0
+        other()
+        with self.assertRaises(ValueError):
+            self.registry.vectorize("market_value")
+
+
+if __name__ == "__main__":
+    unittest.main()
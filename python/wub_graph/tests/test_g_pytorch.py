@@ -0,0 +1,62 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with contextlib.redirect_stdout(io.StringIO()):  # The module runs its demo on import
+    from g_pytorch import WubGraphPyTorch
+
+
+class OverrideTest(unittest.TestCase):
+    def setUp(self):
+        graph = WubGraphPyTorch()
+        self.a = graph.input("a", value=2.0)
+        self.b = graph.input("b", value=3.0)
+        self.product = graph.fn(lambda a, b: a * b)(self.a, self.b)
+        self.doubled = graph.fn(lambda p: p * 2)(self.product)
+
+    def test_override_node_never_computed(self):
+        with self.product.override(10.0):
+            self.assertEqual(self.product.get_value(), 10.0)
+            self.assertEqual(self.doubled.get_value(), 20.0)
+        self.assertEqual(self.product.get_value(), 6.0)
+        self.assertEqual(self.doubled.get_value(), 12.0)
+
+    def test_override_computed_node(self):
+        self.assertEqual(self.doubled.get_value(), 12.0)
+        with self.product.override(10.0):
+            self.assertEqual(self.doubled.get_value(), 20.0)
+        self.assertEqual(self.doubled.get_value(), 12.0)
+
+    def test_override_input(self):
+        self.assertEqual(self.doubled.get_value(), 12.0)
+        with self.a.override(5.0):
+            self.assertEqual(self.doubled.get_value(), 30.0)
+        self.assertEqual(self.doubled.get_value(), 12.0)
+
+    def test_override_survives_upstream_change(self):
+        graph = WubGraphPyTorch()
+        a = graph.input("a", value=1.0)
+        b = graph.fn(lambda x: x * 2)(a)
+        c = graph.fn(lambda x: x + 1)(b)
+        self.assertEqual(c.get_value(), 3.0)
+        with b.override(100.0):
+            a.set_value(5.0)
+            self.assertEqual(b.get_value(), 100.0)
+            self.assertEqual(c.get_value(), 101.0)
+        self.assertEqual(b.get_value(), 10.0)
+        self.assertEqual(c.get_value(), 11.0)
+
+    def test_nested_overrides(self):
+        with self.product.override(10.0):
+            with self.product.override(20.0):
+                self.assertEqual(self.doubled.get_value(), 40.0)
+            self.assertEqual(self.doubled.get_value(), 20.0)
+        self.assertEqual(self.doubled.get_value(), 12.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
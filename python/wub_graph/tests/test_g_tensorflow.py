@@ -0,0 +1,84 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with contextlib.redirect_stdout(io.StringIO()):  # The module runs its demo on import
+    from g_tensorflow import WubGraphRawTFStyle
+
+
+class ExecuteTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = graph = WubGraphRawTFStyle()
+        graph.input("a")
+        graph.input("b")
+        graph.input("unused")
+
+        @graph.fn
+        def s(a, b):
+            return a + b
+
+        s("a", "b")
+
+    def test_execute(self):
+        self.assertEqual(self.graph.execute({"a": 1, "b": 2})["s"], 3)
+
+    def test_missing_input_raises(self):
+        with self.assertRaisesRegex(ValueError, "Missing input value for 'b'"):
+            self.graph.execute({"a": 1})
+
+    def test_missing_input_raises_when_compiled(self):
+        self.graph.compile()
+        with self.assertRaisesRegex(ValueError, "Missing input value for 'b'"):
+            self.graph.execute({"a": 1})
+
+    def test_unused_input_may_be_left_out(self):
+        results = self.graph.execute({"a": 1, "b": 2})
+        self.assertIsNone(results["unused"])
+        self.graph.compile()
+        self.assertEqual(self.graph.execute({"a": 1, "b": 2}), results)
+
+
+class ReplacedNodeTest(unittest.TestCase):
+    def test_replaced_input_raises(self):
+        graph = WubGraphRawTFStyle()
+        graph.input("a")
+        graph.fn(lambda a: a + 1)("a")
+        graph.input("a")
+        with self.assertRaisesRegex(ValueError, "replaced"):
+            graph.execute({"a": 1})
+
+    def test_replaced_op_raises(self):
+        graph = WubGraphRawTFStyle()
+        graph.input("a")
+
+        def f(a):
+            return a + 1
+
+        def g(f):
+            return f * 2
+
+        graph.fn(f)("a")
+        graph.fn(g)("f")
+        graph.fn(f)("a")
+        with self.assertRaisesRegex(ValueError, "replaced"):
+            graph.topological_sort()
+
+    def test_input_shadowed_by_op_raises(self):
+        graph = WubGraphRawTFStyle()
+        graph.input("a")
+
+        def a(x):
+            return x
+
+        graph.input("x")
+        graph.fn(a)("x")
+        with self.assertRaisesRegex(ValueError, "replaced"):
+            graph.execute({"x": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,27 @@
 import pyarrow as pa
 import pyarrow.ipc as ipc
+import mmap
 import os
+import gc
+import sys
 import ctypes
+import struct
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 SHM_NAME = "/dev/shm/arrow_shm"
 
+# Pre-fault the whole mapping in the mmap call itself (Linux, Python 3.10+)
+MAP_FLAGS = mmap.MAP_SHARED | getattr(mmap, "MAP_POPULATE", 0)
+
+# Header layout: an int32 table count, then int64 table sizes at Metadata.table_size_bytes.offset
+_NUM_TABLES = struct.Struct("=i")
+
+@functools.lru_cache(maxsize=32)
+def _table_sizes(num_tables):
+    return struct.Struct(f"={num_tables}q")
+
 class Metadata(ctypes.Structure):
     _fields_ = [
         ("num_tables", ctypes.c_int),
@@ -16,58 +32,68 @@ def read_table_from_buffer(buffer):
     with pa.ipc.open_stream(buffer) as reader:
         return reader.read_all()
 
-def read_metadata(mmap):
-    # Read the number of tables
-    num_tables = np.frombuffer(mmap.read(ctypes.sizeof(ctypes.c_int)), dtype=np.int32)[0]
-    
-    # Define the full metadata structure
-    class FullMetadata(ctypes.Structure):
-        _fields_ = [
-            ("num_tables", ctypes.c_int),
-            ("table_size_bytes", ctypes.c_int64 * num_tables)
-        ]
-    
-    # Calculate the full metadata size
-    metadata_size = ctypes.sizeof(FullMetadata)
-    
-    # Seek back to the beginning and read the full metadata
-    mmap.seek(0)
-    metadata_buffer = mmap.read(metadata_size)
-    
-    return FullMetadata.from_buffer_copy(metadata_buffer)
+def read_metadata(buffer):
+    # Read the header in place from a buffer over the whole mapping:
+    # num_tables at offset 0, then the int64 sizes after the struct's alignment padding
+    num_tables, = _NUM_TABLES.unpack_from(buffer, 0)
+    sizes = _table_sizes(num_tables).unpack_from(buffer, Metadata.table_size_bytes.offset)
+    return num_tables, sizes
+
+def advise_sequential(mm):
+    # The whole mapping is read front to back: prefetch it and widen readahead
+    if hasattr(mm, "madvise"):  # Python 3.8+ on platforms with madvise(2)
+        mm.madvise(mmap.MADV_WILLNEED)
+        mm.madvise(mmap.MADV_SEQUENTIAL)
 
 def read_tables_from_shm():
     if not os.path.exists(SHM_NAME):
         raise FileNotFoundError(f"Shared memory segment {SHM_NAME} not found")
 
-    with pa.memory_map(SHM_NAME, mode='r') as mmap:
-        metadata = read_metadata(mmap)
-        
-        tables = []
-        offset = ctypes.sizeof(Metadata) + (metadata.num_tables - 1) * ctypes.sizeof(ctypes.c_int64)
-        
-        for size in metadata.table_size_bytes:
-            if size > 0:
-                mmap.seek(offset)
-                table_buffer = mmap.read(size)
-                table = read_table_from_buffer(pa.py_buffer(table_buffer))
-                tables.append(table)
-                offset += size
+    # A raw mmap (rather than pa.memory_map) so the kernel can be advised about the access pattern.
+    # It is not closed explicitly: the tables are zero-copy views and keep the mapping alive.
+    with open(SHM_NAME, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, flags=MAP_FLAGS, prot=mmap.PROT_READ)
+    advise_sequential(mm)
+    
+    # One zero-copy buffer over the mapping; tables are sliced out of it without seeking
+    buffer = pa.py_buffer(mm)
+    num_tables, table_size_bytes = read_metadata(buffer)
+    
+    # Tables are packed back to back after the header: offsets are a prefix sum of the sizes
+    header_size = ctypes.sizeof(Metadata) + (num_tables - 1) * ctypes.sizeof(ctypes.c_int64)
+    offsets = header_size + np.concatenate(([0], np.cumsum(table_size_bytes[:-1], dtype=np.int64)))
+    
+    slices = [buffer.slice(int(offset), int(size))
+              for offset, size in zip(offsets, table_size_bytes) if size > 0]
+
+    # Tables decode independently and Arrow releases the GIL while parsing, so decode them in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        tables = list(executor.map(read_table_from_buffer, slices))
 
     return tables
 
-def print_table_info(table):
+def print_table_info(table, full=False, preview_rows=10):
     print(f"Table shape: {table.num_rows} rows x {table.num_columns} columns")
     print("Schema:")
     print(table.schema)
-    print("\nAll rows:")
-    print(table.to_pandas())
+    if full:
+        # Converts (and copies) the whole table to pandas, so only done on request
+        print("\nAll rows:")
+        df = table.to_pandas()
+        print(df)
+        del df
+        gc.collect()
+    else:
+        # Only the previewed rows are converted; slicing the table is zero-copy
+        print(f"\nFirst {min(preview_rows, table.num_rows)} rows:")
+        print(table.slice(0, preview_rows).to_pandas())
     print("\n" + "="*50 + "\n")
 
 if __name__ == "__main__":
     tables = read_tables_from_shm()
     print(f"Successfully read {len(tables)} tables from shared memory.")
     
+    full = "--full" in sys.argv[1:]
     for i, table in enumerate(tables):
         print(f"Table {i+1}:")
-        print_table_info(table)
\ No newline at end of file
+        print_table_info(table, full=full)
\ No newline at end of file
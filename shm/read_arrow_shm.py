@@ -4,10 +4,24 @@ import mmap
 import os
 import pandas as pd
 import gc
+import sys
 import ctypes
+import struct
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 SHM_NAME = "arrow_shm"
 
+# Pre-fault the whole mapping in the mmap call itself (Linux, Python 3.10+)
+MAP_FLAGS = mmap.MAP_SHARED | getattr(mmap, "MAP_POPULATE", 0)
+
+# Header layout: an int32 table count, then int64 table sizes at Metadata.table_size_bytes.offset
+_NUM_TABLES = struct.Struct("=i")
+
+@functools.lru_cache(maxsize=32)
+def _table_sizes(num_tables):
+    return struct.Struct(f"={num_tables}q")
+
 class Metadata(ctypes.Structure):
     _fields_ = [
         ("num_tables", ctypes.c_int),
@@ -25,48 +39,62 @@ def read_tables_from_shm():
         raise FileNotFoundError(f"Shared memory segment {SHM_NAME} not found")
 
     with open(shm_path, "rb") as f:
-        with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
-            # Read the number of tables
-            num_tables = ctypes.c_int.from_buffer_copy(mm[:ctypes.sizeof(ctypes.c_int)]).value
-
-            # Calculate the full metadata size
-            metadata_size = ctypes.sizeof(Metadata) + (num_tables - 1) * ctypes.sizeof(ctypes.c_int64)
-
-            # Read the full metadata
-            metadata_buffer = mm[:metadata_size]
-            
-            class FullMetadata(ctypes.Structure):
-                _fields_ = [
-                    ("num_tables", ctypes.c_int),
-                    ("table_size_bytes", ctypes.c_int64 * num_tables)
-                ]
-
-            metadata = FullMetadata.from_buffer_copy(metadata_buffer)
-
-            tables = []
-            offset = metadata_size
-            for i in range(num_tables):
-                size = metadata.table_size_bytes[i]
-                if size > 0:
-                    table_buffer = memoryview(mm[offset:offset+size])
-                    table = read_table_from_buffer(table_buffer)
-                    tables.append(table)
-                    offset += size
+        # Not closed explicitly: the tables below are zero-copy views into the mapping,
+        # which is unmapped once the last of them releases its export
+        mm = mmap.mmap(f.fileno(), 0, flags=MAP_FLAGS, prot=mmap.PROT_READ)
+
+    # The whole segment is read front to back: prefetch it and widen readahead
+    if hasattr(mm, "madvise"):  # Python 3.8+ on platforms with madvise(2)
+        mm.madvise(mmap.MADV_WILLNEED)
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+
+    # Read the number of tables
+    num_tables, = _NUM_TABLES.unpack_from(mm, 0)
+
+    # Calculate the full metadata size
+    metadata_size = ctypes.sizeof(Metadata) + (num_tables - 1) * ctypes.sizeof(ctypes.c_int64)
+
+    # Read the table sizes straight out of the mapping
+    table_size_bytes = _table_sizes(num_tables).unpack_from(mm, Metadata.table_size_bytes.offset)
+
+    # Slicing a memoryview of the mmap is zero-copy, unlike slicing the mmap itself
+    mv = memoryview(mm)
+    slices = []
+    offset = metadata_size
+    for i in range(num_tables):
+        size = table_size_bytes[i]
+        if size > 0:
+            slices.append(pa.py_buffer(mv[offset:offset+size]))
+            offset += size
+
+    # Tables decode independently and Arrow releases the GIL while parsing, so decode them in parallel
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        tables = list(executor.map(read_table_from_buffer, slices))
 
     return tables
 
-def print_table_info(table):
+def print_table_info(table, full=False, preview_rows=10):
     print(f"Table shape: {table.num_rows} rows x {table.num_columns} columns")
     print("Schema:")
     print(table.schema)
-    print("\nAll rows:")
-    print(table.to_pandas())
+    if full:
+        # Converts (and copies) the whole table to pandas, so only done on request
+        print("\nAll rows:")
+        df = table.to_pandas()
+        print(df)
+        del df
+        gc.collect()
+    else:
+        # Only the previewed rows are converted; slicing the table is zero-copy
+        print(f"\nFirst {min(preview_rows, table.num_rows)} rows:")
+        print(table.slice(0, preview_rows).to_pandas())
     print("\n" + "="*50 + "\n")
 
 if __name__ == "__main__":
     tables = read_tables_from_shm()
     print(f"Successfully read {len(tables)} tables from shared memory.")
     
+    full = "--full" in sys.argv[1:]
     for i, table in enumerate(tables):
         print(f"Table {i+1}:")
-        print_table_info(table)
+        print_table_info(table, full=full)
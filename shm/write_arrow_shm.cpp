@@ -56,7 +56,7 @@ std::shared_ptr<arrow::Table> create_table(int num_rows, int64_t start_time) {
     return arrow::Table::Make(schema, {timestamp_array, price_array, volume_array});
 }
 
-void write_table_to_buffer(const std::shared_ptr<arrow::Table>& table, char* buffer, int64_t& offset) {
+std::shared_ptr<arrow::Buffer> serialize_table(const std::shared_ptr<arrow::Table>& table) {
     arrow::Result<std::shared_ptr<arrow::io::BufferOutputStream>> maybe_out_stream = 
         arrow::io::BufferOutputStream::Create(1024 * 1024, arrow::default_memory_pool());
     handle_status(maybe_out_stream.status());
@@ -73,10 +73,7 @@ void write_table_to_buffer(const std::shared_ptr<arrow::Table>& table, char* buf
 
     arrow::Result<std::shared_ptr<arrow::Buffer>> maybe_buf = out_stream->Finish();
     handle_status(maybe_buf.status());
-    std::shared_ptr<arrow::Buffer> buf = maybe_buf.ValueOrDie();
-
-    memcpy(buffer + offset, buf->data(), buf->size());
-    offset += buf->size();
+    return maybe_buf.ValueOrDie();
 }
 
 int main() {
@@ -85,9 +82,21 @@ int main() {
     const int num_tables = 3;
     const std::vector<int> rows_per_table = {3, 4, 5};  // Variable number of rows
 
+    int64_t current_time = std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::system_clock::now().time_since_epoch()
+    ).count();
+
+    // Serialize up front so the segment can be sized exactly, with tables packed back to back
+    std::vector<std::shared_ptr<arrow::Buffer>> buffers;
+    int64_t data_size = 0;
+    for (int i = 0; i < num_tables; ++i) {
+        auto table = create_table(rows_per_table[i], current_time + i * 1000000000);
+        buffers.push_back(serialize_table(table));
+        data_size += buffers.back()->size();
+    }
+
     // Calculate total size needed
     int64_t metadata_size = sizeof(Metadata) + (num_tables - 1) * sizeof(int64_t);
-    int64_t data_size = num_tables * 1024 * 1024;  // Assume max 1MB per table
     int64_t total_size = metadata_size + data_size;
 
     // Create shared memory
@@ -104,15 +113,10 @@ int main() {
     // Write tables
     char* data_buffer = mem + metadata_size;
     int64_t offset = 0;
-    int64_t current_time = std::chrono::duration_cast<std::chrono::nanoseconds>(
-        std::chrono::system_clock::now().time_since_epoch()
-    ).count();
-
     for (int i = 0; i < num_tables; ++i) {
-        auto table = create_table(rows_per_table[i], current_time + i * 1000000000);
-        int64_t start_offset = offset;
-        write_table_to_buffer(table, data_buffer, offset);
-        metadata->table_size_bytes[i] = offset - start_offset;
+        memcpy(data_buffer + offset, buffers[i]->data(), buffers[i]->size());
+        offset += buffers[i]->size();
+        metadata->table_size_bytes[i] = buffers[i]->size();
         std::cout << "Table " << i+1 << " size: " << metadata->table_size_bytes[i] << " bytes" << std::endl;
     }
 